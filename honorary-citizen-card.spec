@@ -33,6 +33,11 @@ if os.path.exists(RESOURCES_DIR):
     for png_file in png_files:
         datas.append((png_file, 'resources'))
     
+    # Card template (optional)
+    card_template = os.path.join(RESOURCES_DIR, 'card_template.json')
+    if os.path.exists(card_template):
+        datas.append((card_template, 'resources'))
+    
     # Style files
     styles_dir = os.path.join(RESOURCES_DIR, 'styles')
     if os.path.exists(styles_dir):
@@ -76,7 +81,18 @@ hidden_imports = [
     'openpyxl.cell',
     'dateutil',
     'pytz',
-    'openpyxl'
+    'openpyxl',
+    # 출력 방식에서 필요할 때 불러오는 모듈
+    'win32print',
+    'win32ui',
+    'PIL.ImageWin',
+    # CARD_PRINT_FORMAT=pdf 벡터 PDF (card_pdf에서 필요할 때 불러옴)
+    'reportlab',
+    'reportlab.pdfgen.canvas',
+    'reportlab.pdfbase.pdfmetrics',
+    'reportlab.pdfbase.ttfonts',
+    'reportlab.lib.utils',
+    'reportlab.rl_config',
 ]
 
 # OpenCV 바이너리 수집
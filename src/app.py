@@ -3,6 +3,8 @@ from PyQt6.QtCore import Qt
 from screens.photo_screen import PhotoScreen
 from screens.info_screen import InfoScreen
 from screens.main_screen import MainScreen
+from utils.excel import ExcelManager
+from utils.print_queue import get_print_queue
 from config import Config
 
 class MainWindow(QMainWindow):
@@ -83,4 +85,11 @@ class MainWindow(QMainWindow):
         """프로그램 종료 시 카메라 해제"""
         if hasattr(self, 'camera') and self.camera is not None:
             self.camera.release()
+        self.central_widget.widget(self.frames["PhotoFrame"]).release_camera()
+        
+        # 진행 중인 출력 작업 마무리
+        get_print_queue().stop(timeout=30)
+        
+        # 미병합 저널을 엑셀 파일에 반영
+        ExcelManager.compact()
         event.accept()
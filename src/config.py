@@ -1,4 +1,5 @@
 import os
+import platform
 
 
 class Config:
@@ -20,15 +21,44 @@ class Config:
     BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
     DATA_DIR = os.path.join(DESKTOP_PATH, 'GureyeCard')  # 바탕화면에 폴더 생성
     EXCEL_PATH = os.path.join(DATA_DIR, 'visitors.xlsx')
+
+    # 발급 저널 설정 (엑셀 파일에 주기적으로 병합)
+    JOURNAL_PATH = os.path.join(DATA_DIR, 'visitors.journal.jsonl')
+    JOURNAL_COMPACT_THRESHOLD = 50  # 저널 항목이 이 수 이상이면 즉시 병합
+    JOURNAL_COMPACT_IDLE_SECONDS = 30  # 마지막 발급 후 이 시간 동안 유휴 상태면 병합
+
+    # 방문자 저장소 설정 ('excel': visitors.xlsx 직접 사용, 'sqlite': DB 사용,
+    # 'sharded': 월별 분할 파일 + 블룸 필터 사용 - 'sqlite'/'sharded'는 필요 시 엑셀 내보내기)
+    REGISTRY_BACKEND = os.environ.get('CARD_REGISTRY_BACKEND', 'excel')
+    DB_PATH = os.path.join(DATA_DIR, 'visitors.db')
+    SHARD_DIR = os.path.join(DATA_DIR, 'shards')
+    SHARD_FILTER_CAPACITY = 20000  # 월별 필터 기본 용량 (초과 시 재생성 도구로 다시 만듦)
+    SHARD_FILTER_FP_RATE = 0.001  # 목표 오탐률
+
+    # 여러 키오스크 공유 저장소 설정 (공유 폴더 경로, 비어 있으면 사용하지 않음)
+    SHARED_REGISTRY_DIR = os.environ.get('CARD_SHARED_REGISTRY_DIR', '')
+    KIOSK_ID = os.environ.get('CARD_KIOSK_ID', platform.node() or 'kiosk')
     
     # 카메라 설정 - 16:9 비율 최적화
-    CAMERA_WIDTH = 1920
-    CAMERA_HEIGHT = 1080
-    CAMERA_FPS = 30
+    CAMERA_WIDTH = int(os.environ.get('CARD_CAMERA_WIDTH', 1920))
+    CAMERA_HEIGHT = int(os.environ.get('CARD_CAMERA_HEIGHT', 1080))
+    CAMERA_FPS = int(os.environ.get('CARD_CAMERA_FPS', 30))
+    CAMERA_INDEX = int(os.environ.get('CARD_CAMERA_INDEX', 0))
+    CAMERA_CACHE_PATH = os.path.join(DATA_DIR, 'camera_cache.json')  # 장치별로 협상된 해상도/fps/FOURCC
+
+    # 프레임 입력 ('camera': 웹캠, 'video': 동영상 파일 또는 이미지 폴더 반복 재생,
+    # 'synthetic': 합성 프레임 - 'video'/'synthetic'은 카메라 없이 시험할 때 사용, 해상도/fps는 CAMERA_* 설정)
+    FRAME_SOURCE = os.environ.get('CARD_FRAME_SOURCE', 'camera')
+    FRAME_SOURCE_PATH = os.environ.get('CARD_FRAME_SOURCE_PATH', '')  # 'video' 입력 파일 또는 폴더
     
     # 프리뷰 크기 설정
     PREVIEW_WIDTH = 960
     PREVIEW_HEIGHT = 540
+    PREVIEW_MIN_FPS = 10  # 처리가 늦을 때 낮출 수 있는 최저 표시 fps
+    PREVIEW_IDLE_FPS = 5  # 카메라 앞에 움직임이 없을 때 fps
+    PREVIEW_IDLE_SECONDS = 20  # 이 시간 동안 움직임이 없으면 유휴 상태로 전환
+    PREVIEW_MOTION_THRESHOLD = 3.0  # 움직임으로 판단할 평균 밝기 변화 (0~255)
+    PREVIEW_DEBUG = os.environ.get('CARD_PREVIEW_DEBUG', '') == '1'  # 미리보기에 성능 수치 표시
     
     # 카드 크기 (mm)
     CARD_WIDTH = 58
@@ -42,11 +72,38 @@ class Config:
     # 리소스 경로 추가
     RESOURCES_DIR = os.path.join(BASE_DIR, 'resources')
     OUTPUT_DIR = os.path.join(DATA_DIR, 'output')  # 바탕화면의 폴더 안에 output 폴더
-    PRINTER_DPI = 300
+    PRINTER_DPI = int(os.environ.get('CARD_PRINTER_DPI', 300))  # 카드 래스터 해상도 (디자인은 mm 단위)
+
+    # 발급 카드 보관 형식 ('png': 무손실, 'jpeg', 'webp' - 품질은 jpeg/webp에만 적용)
+    ARCHIVE_FORMAT = os.environ.get('CARD_ARCHIVE_FORMAT', 'jpeg')
+    ARCHIVE_QUALITY = 90
+    ARCHIVE_RETENTION_MONTHS = 6  # 최근 N개월은 파일 그대로 두고 이전 달은 zip으로 묶음
+    ARCHIVE_DELETE_AFTER_MONTHS = 0  # N개월이 지난 zip 삭제 (0이면 삭제하지 않음)
+
+    # 출력 방식 ('win32': Windows 기본 프린터, 'lpr': CUPS, 'file': 폴더에 PNG 저장, 'mock': 가상 프린터)
+    PRINT_BACKEND = os.environ.get('CARD_PRINT_BACKEND', 'win32' if os.name == 'nt' else 'lpr')
+    # 출력 데이터 ('raster': 카드 이미지, 'pdf': 글자는 벡터인 PDF - PDF를 받는 lpr/file 출력에만 적용)
+    PRINT_FORMAT = os.environ.get('CARD_PRINT_FORMAT', 'raster')
+    PDF_IMAGE_DPI = 300  # PDF에 넣는 사진/배경 최대 해상도 (글자는 벡터라 해상도와 무관)
+    PDF_IMAGE_QUALITY = 85
+    PRINTER_NAME = os.environ.get('CARD_PRINTER_NAME', '')  # lpr 출력 프린터 (비어 있으면 기본 프린터)
+    FILE_PRINTER_DIR = os.path.join(DATA_DIR, 'file_printer')
+    PRINT_MAX_RETRIES = 3  # 출력 실패 시 재시도 횟수
+    PRINT_RETRY_BACKOFF = 1.0  # 첫 재시도 대기 시간 (초, 재시도마다 2배)
+    PRINT_SPOOL_DIR = os.path.join(DATA_DIR, 'spool')  # 출력 완료 전 작업 보관 폴더
+
+    # 일괄 출력 용지 설정 (mm)
+    SHEET_PAPER = 'A4'  # 'A4' 또는 'Letter'
+    SHEET_MARGIN = 5  # 용지 가장자리 여백
+    SHEET_GAP = 4  # 카드 사이 간격
+    SHEET_CROP_MARK = 3  # 재단선 길이 (0이면 그리지 않음)
     
     PHOTO_WIDTH = 35
     PHOTO_HEIGHT = 40
     
+    # 카드 디자인 파일 (없으면 기본 디자인 사용)
+    CARD_TEMPLATE_PATH = os.path.join(RESOURCES_DIR, 'card_template.json')
+    
     # 초기 폴더 생성
     @classmethod
     def initialize_directories(cls):
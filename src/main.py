@@ -2,6 +2,7 @@ import sys
 import os
 import logging
 import shutil
+import threading
 from datetime import datetime
 from PyQt6.QtWidgets import QApplication
 from PyQt6.QtCore import Qt
@@ -42,6 +43,35 @@ def setup_resources():
     except Exception as e:
         logging.error(f"리소스 설정 중 오류 발생: {e}", exc_info=True)
 
+def setup_visitor_index():
+    """방문자 저장소 준비 및 중복 체크 인덱스 생성"""
+    try:
+        from utils.excel import ExcelManager
+        count = ExcelManager.initialize()
+        logging.info(f"Visitor registry ready ({Config.REGISTRY_BACKEND}): {count} entries")
+    except Exception as e:
+        logging.error(f"방문자 인덱스 생성 중 오류 발생: {e}", exc_info=True)
+
+def setup_card_printer():
+    """카드 프린터 및 폰트 미리 로드"""
+    try:
+        from utils.card_printer import get_card_printer
+        get_card_printer()
+        logging.info("Card printer fonts loaded")
+    except Exception as e:
+        logging.error(f"카드 프린터 초기화 중 오류 발생: {e}", exc_info=True)
+
+def setup_archive():
+    """카드 보관 폴더 색인 확인 및 보관 정책 적용 (시작을 늦추지 않도록 백그라운드에서 실행)"""
+    def maintain():
+        try:
+            from utils.card_printer import get_card_printer
+            get_card_printer().archive.index.maintain()
+        except Exception as e:
+            logging.error(f"카드 보관 폴더 정리 중 오류 발생: {e}", exc_info=True)
+
+    threading.Thread(target=maintain, name='archive-maintenance', daemon=True).start()
+
 def main():
     try:
         logging.info("Starting application...")
@@ -49,6 +79,15 @@ def main():
         # 리소스 설정 (프로그램 시작 시 한 번만 실행)
         setup_resources()
         
+        # 중복 체크 인덱스 생성 (프로그램 시작 시 한 번만 실행)
+        setup_visitor_index()
+        
+        # 카드 출력용 폰트 로드 (발급 시마다 폰트를 다시 읽지 않도록)
+        setup_card_printer()
+        
+        # 카드 보관 폴더 정리 (오래된 달 압축)
+        setup_archive()
+        
         # 앱 생성
         app = QApplication(sys.argv)
         
@@ -85,6 +124,16 @@ def main():
         
         logging.info("Application window created and shown")
         
+        # 이전 실행에서 출력되지 않은 카드 다시 출력
+        try:
+            from utils.excel import ExcelManager
+            from utils.print_queue import get_print_queue
+            recovered = get_print_queue().recover(register=ExcelManager.ensure_registered)
+            if recovered:
+                logging.info(f"Recovered {recovered} unfinished print jobs")
+        except Exception as e:
+            logging.error(f"출력 작업 복구 중 오류 발생: {e}", exc_info=True)
+        
         # 이벤트 루프 시작
         sys.exit(app.exec())
         
@@ -7,11 +7,11 @@ from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout,
 from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QImage, QPixmap
 import cv2
-from PIL import Image
 import numpy as np
 from screens.virtual_keyboard import VirtualKeyboard
 from utils.excel import ExcelManager
-from utils.card_printer import print_honorary_citizen_card
+from utils.photo import crop_photo
+from utils.print_queue import PRINTING, QUEUED, RENDERING, get_print_queue
 from config import Config
 
 class InfoScreen(QWidget):
@@ -25,6 +25,15 @@ class InfoScreen(QWidget):
         self.zoom_level = 1.0  # 기본 줌 레벨
         self.initUI()
         
+        # 카드 출력은 별도 작업 스레드에서 처리
+        self.print_queue = get_print_queue()
+        self.print_queue.job_saved.connect(self.on_job_saved)
+        self.print_queue.job_finished.connect(self.on_print_finished)
+        self.saving_job_id = None
+        self.print_queue.printer_status_changed.connect(self.update_printer_status)
+        self.print_queue.job_state_changed.connect(self.update_print_progress)
+        self.update_printer_status(*self.print_queue.printer_status())
+        
     def initUI(self):
         layout = QVBoxLayout()
         layout.setContentsMargins(0, 0, 0, 0)
@@ -186,6 +195,7 @@ class InfoScreen(QWidget):
         
         # 버튼들
         issue_btn = QPushButton("발급")
+        self.issue_btn = issue_btn
         retake_btn = QPushButton("재촬영")
         reset_btn = QPushButton("초기화")
         
@@ -213,6 +223,16 @@ class InfoScreen(QWidget):
         button_layout.addWidget(retake_btn)
         button_layout.addWidget(reset_btn)
         
+        # 프린터 상태 (발급 버튼 아래 표시)
+        self.printer_status_label = QLabel()
+        self.printer_status_label.setStyleSheet("font-size: 20px;")
+        
+        # 출력 진행 상황 (출력 중인 작업이 있을 때만 표시)
+        self.print_progress_label = QLabel()
+        self.print_progress_label.setStyleSheet("color: #555555; font-size: 20px;")
+        self.print_progress_label.hide()
+        self.print_progress_state = QUEUED
+        
         # 폼에 위젯 추가
         form_layout.addWidget(name_label)
         form_layout.addWidget(name_hint)
@@ -221,6 +241,8 @@ class InfoScreen(QWidget):
         form_layout.addWidget(birth_hint)
         form_layout.addWidget(self.birth_input)
         form_layout.addWidget(button_container)
+        form_layout.addWidget(self.printer_status_label)
+        form_layout.addWidget(self.print_progress_label)
         form_layout.addStretch()  # 버튼과 입력 필드 사이 공간
         
         
@@ -356,68 +378,13 @@ class InfoScreen(QWidget):
     def get_cropped_image(self):
         """현재 preview에 보이는 영역을 그대로 크롭하여 반환"""
         if self.parent.current_image is not None:
-            # 원본 이미지 복사
-            image = self.parent.current_image.copy()
-            
-            # BGR을 RGB로 변환
-            image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
-            img_height, img_width = image_rgb.shape[:2]
-            
-            # 회전 적용
-            if self.rotation_angle != 0:
-                matrix = cv2.getRotationMatrix2D((img_width/2, img_height/2), self.rotation_angle, 1)
-                image_rgb = cv2.warpAffine(image_rgb, matrix, (img_width, img_height))
-            
-            # preview 프레임과 이미지의 비율 계산
-            frame_ratio = self.preview_frame.width() / self.preview_frame.height()
-            image_ratio = img_width / img_height
-            
-            # 현재 줌 레벨 가져오기
-            zoom = self.zoom_slider.value() / 10.0
-            
-            # preview에서의 이미지 크기 계산
-            if image_ratio > frame_ratio:
-                # 이미지가 더 넓은 경우
-                display_width = self.preview_frame.width() * zoom
-                display_height = display_width / image_ratio
-            else:
-                # 이미지가 더 높은 경우
-                display_height = self.preview_frame.height() * zoom
-                display_width = display_height * image_ratio
-            
-            # 이미지 리사이즈 (현재 줌 레벨 적용)
-            resized = cv2.resize(image_rgb, (int(display_width), int(display_height)))
-            
-            # preview의 중심점과 현재 이동 offset을 고려한 크롭 영역 계산
-            x_center = (display_width / 2) - self.image_position["x"]
-            y_center = (display_height / 2) - self.image_position["y"]
-            
-            # preview 프레임 크기만큼의 영역을 크롭
-            x1 = int(x_center - self.preview_frame.width() / 2)
-            y1 = int(y_center - self.preview_frame.height() / 2)
-            x2 = int(x_center + self.preview_frame.width() / 2)
-            y2 = int(y_center + self.preview_frame.height() / 2)
-            
-            # 크롭 범위가 이미지를 벗어나지 않도록 조정
-            x1 = max(0, min(x1, resized.shape[1]))
-            y1 = max(0, min(y1, resized.shape[0]))
-            x2 = max(0, min(x2, resized.shape[1]))
-            y2 = max(0, min(y2, resized.shape[0]))
-            
-            # 이미지 크롭
-            cropped = resized[y1:y2, x1:x2]
-            
-            # OpenCV 이미지를 PIL Image로 변환
-            image_pil = Image.fromarray(cropped)
-            
-            # 프린터 출력 해상도에 맞게 최종 크기 조정
-            final_width = int(Config.PHOTO_WIDTH * Config.PRINTER_DPI / 25.4)
-            final_height = int(Config.PHOTO_HEIGHT * Config.PRINTER_DPI / 25.4)
-            
-            # 최종 크기로 리사이즈
-            image_pil = image_pil.resize((final_width, final_height), Image.Resampling.LANCZOS)
-            
-            return image_pil
+            return crop_photo(
+                self.parent.current_image,
+                (self.preview_frame.width(), self.preview_frame.height()),
+                rotation_angle=self.rotation_angle,
+                zoom=self.zoom_slider.value() / 10.0,
+                offset=(self.image_position["x"], self.image_position["y"])
+            )
             
         return None
 
@@ -437,7 +404,11 @@ class InfoScreen(QWidget):
             return
         
         print("중복 체크 시작...")
-        is_duplicate = ExcelManager.check_duplicate(name, birthdate)
+        try:
+            is_duplicate = ExcelManager.check_duplicate(name, birthdate)
+        except Exception:
+            QMessageBox.critical(self, "오류", "발급 기록을 확인할 수 없습니다.\n담당자에게 문의해주세요.")
+            return
         print(f"중복 체크 결과: {is_duplicate}")
         
         if is_duplicate:
@@ -449,21 +420,63 @@ class InfoScreen(QWidget):
         cropped_image = self.get_cropped_image()
         if cropped_image:
             print("이미지 크롭 성공")
-            if ExcelManager.save_visitor_info(name, birthdate):
-                print("방문자 정보 저장 성공")
-                success, _ = print_honorary_citizen_card(name, birthdate, cropped_image)
-                if success:
-                    print("카드 발급 성공")
-                    QMessageBox.information(self, "안내", "카드가 발급되었습니다.")
-                    self.reset_form()
-                    self.parent.show_frame("MainScreen")
-                else:
-                    print("카드 발급 실패")
-                    QMessageBox.critical(self, "오류", "카드 발급 중 오류가 발생했습니다.")
-            else:
-                print("방문자 정보 저장 실패")
-                QMessageBox.critical(self, "오류", "데이터 저장 중 문제가 발생했습니다.")
+            # 출력 작업을 디스크에 먼저 보관한 뒤 방문자 등록 (등록된 방문자의 작업이 사라지지 않도록)
+            # 저장은 작업 스레드에서 진행하고 끝나면 on_job_saved로 결과를 받음 (그동안 발급 버튼만 잠금)
+            self.issue_btn.setEnabled(False)
+            self.saving_job_id = self.print_queue.submit(name, birthdate, cropped_image,
+                                                         register=ExcelManager.save_visitor_info)
+            print(f"카드 출력 요청: {self.saving_job_id}")
+
+    def on_job_saved(self, job_id, success, detail):
+        """발급 기록 저장 결과 처리 (UI 스레드에서 호출)"""
+        if job_id != self.saving_job_id:
+            return
+        self.saving_job_id = None
+        self.issue_btn.setEnabled(True)
+
+        if success:
+            print("방문자 정보 저장 성공")
+            # 출력 대기열에 추가 후 바로 다음 방문자 촬영 가능
+            QMessageBox.information(self, "안내", "카드가 발급되었습니다.")
+            self.reset_form()
+            self.parent.show_frame("MainScreen")
+        else:
+            print(f"방문자 정보 저장 실패: {detail}")
+            QMessageBox.critical(self, "오류", "데이터 저장 중 문제가 발생했습니다.")
     
+    def on_print_finished(self, job_id, success, detail):
+        """출력 작업 완료 처리 (UI 스레드에서 호출)"""
+        if success:
+            print(f"카드 발급 성공: {job_id} ({detail})")
+        else:
+            print(f"카드 발급 실패: {job_id} ({detail})")
+            QMessageBox.critical(self.parent, "오류", "카드 발급 중 오류가 발생했습니다.\n담당자에게 문의해주세요.")
+
+    def update_printer_status(self, available, detail):
+        """프린터 상태 표시 갱신 (작업 스레드가 확인한 값 사용)"""
+        if available:
+            self.printer_status_label.setText("● 프린터 준비됨")
+            self.printer_status_label.setStyleSheet("color: #5B9279; font-size: 20px;")
+        else:
+            self.printer_status_label.setText("● 프린터 사용 불가")
+            self.printer_status_label.setStyleSheet("color: #C0392B; font-size: 20px;")
+        self.printer_status_label.setToolTip(detail)
+
+    def update_print_progress(self, job_id, state):
+        """출력 진행 상황 표시 갱신 (작업 상태가 바뀔 때마다 호출)"""
+        if state in (RENDERING, PRINTING):
+            self.print_progress_state = state
+
+        pending = self.print_queue.pending_count()
+        if not pending:
+            self.print_progress_state = QUEUED
+            self.print_progress_label.hide()
+            return
+
+        labels = {QUEUED: "출력 대기 중", RENDERING: "카드 생성 중", PRINTING: "카드 인쇄 중"}
+        self.print_progress_label.setText(f"{labels[self.print_progress_state]} (남은 카드 {pending}장)")
+        self.print_progress_label.show()
+
     def reset_form(self):
         """폼 초기화"""
         self.name_input.clear()
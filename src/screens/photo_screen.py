@@ -2,11 +2,11 @@ from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QPushButton,
     QLabel, QFrame)
 from PyQt6.QtCore import Qt, QTimer
 from PyQt6.QtGui import QImage, QPixmap
-import cv2
 import logging
 from config import Config
+from utils.camera import CameraCapture
+from utils.preview import PreviewPacer, PreviewScaler
 import os
-import threading
 import time
 
 class PhotoScreen(QWidget):
@@ -14,39 +14,24 @@ class PhotoScreen(QWidget):
         super().__init__(parent)
         self.parent = parent
         self.camera = None
+        self.last_sequence = 0  # 마지막으로 표시한 프레임 번호
+        self.preview_scaler = PreviewScaler()
+        self.preview_image = None  # 미리보기 버퍼를 감싼 QImage (버퍼가 바뀔 때만 새로 생성)
+        self.preview_image_buffer = None
+        self.pacer = PreviewPacer()
+        self.debug_updated_at = 0.0
         self.timer = QTimer()
         self.timer.timeout.connect(self.update_frame)
         
-        # 카메라 초기화를 생성자에서 미리 수행
+        # 카메라는 백그라운드에서 미리 열어 두고 화면은 바로 표시
         self.initialize_camera()
         self.initUI()
     
     def initialize_camera(self):
-        """카메라 초기화"""
-        logging.info("카메라 초기화 시작...")
-        try:
-            self.camera = cv2.VideoCapture(0, cv2.CAP_DSHOW)
-            
-            if not self.camera.isOpened():
-                self.camera = cv2.VideoCapture(0)
-            
-            if self.camera.isOpened():
-                # 카메라 설정 최적화
-                self.camera.set(cv2.CAP_PROP_FRAME_WIDTH, Config.CAMERA_WIDTH)
-                self.camera.set(cv2.CAP_PROP_FRAME_HEIGHT, Config.CAMERA_HEIGHT)
-                self.camera.set(cv2.CAP_PROP_BUFFERSIZE, 1)  # 버퍼 크기 최소화
-                self.camera.set(cv2.CAP_PROP_FPS, Config.CAMERA_FPS)
-                
-                # 초기 프레임 읽기로 카메라 워밍업
-                for _ in range(5):  # 처음 몇 프레임을 버림
-                    self.camera.read()
-                    
-                logging.info("카메라 초기화 완료")
-            else:
-                logging.error("카메라를 찾을 수 없습니다")
-                
-        except Exception as e:
-            logging.error(f"카메라 초기화 오류: {str(e)}")
+        """카메라 초기화 (백그라운드에서 열고 워밍업)"""
+        if self.camera is None:
+            self.camera = CameraCapture()
+        self.camera.open_async()
         
     def initUI(self):
         main_layout = QVBoxLayout(self)
@@ -95,6 +80,19 @@ class PhotoScreen(QWidget):
         preview_y = (Config.DISPLAY_HEIGHT - Config.PREVIEW_HEIGHT) // 2 
         self.preview_frame.move(preview_x, preview_y)
         
+        # 성능 수치 표시 (CARD_PREVIEW_DEBUG=1 일 때만)
+        self.debug_label = QLabel(self.preview_frame)
+        self.debug_label.setStyleSheet("""
+            QLabel {
+                color: #00FF00;
+                background-color: rgba(0, 0, 0, 160);
+                font-size: 14px;
+                padding: 4px;
+            }
+        """)
+        self.debug_label.move(8, 8)
+        self.debug_label.setVisible(Config.PREVIEW_DEBUG)
+        
         # 메시지 표시 라벨 추가
         self.message_label = QLabel(self)
         self.message_label.setFixedSize(Config.PREVIEW_WIDTH, Config.PREVIEW_HEIGHT)  # 프리뷰와 동일한 크기로 설정
@@ -143,31 +141,67 @@ class PhotoScreen(QWidget):
         """위젯이 표시될 때 카메라 시작"""
         super().showEvent(event)
         if not self.timer.isActive():
-            if not self.camera or not self.camera.isOpened():
+            if not self.camera or not (self.camera.is_opened() or self.camera.is_opening()):
                 self.initialize_camera()
-            self.timer.start(int(1000/Config.CAMERA_FPS))
+            # 프레임은 별도 스레드에서 읽고 타이머는 최신 프레임만 화면에 표시
+            self.camera.throttle()
+            self.camera.start()
+            self.pacer = PreviewPacer()
+            self.timer.start(self.pacer.interval_ms)
     
     def update_frame(self):
         """카메라 프레임 업데이트 최적화"""
-        if self.camera and self.camera.isOpened():
-            ret, frame = self.camera.read()
-            if ret:
-                # 프레임 처리 최적화
-                rgb_image = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                h, w, ch = rgb_image.shape
+        if self.camera and self.camera.is_opened():
+            latest = self.camera.latest(self.last_sequence)
+            if latest is not None:
+                self.last_sequence, _, frame = latest
+                started = time.perf_counter()
                 
-                # QImage 생성 (직접 메모리 참조)
-                qt_image = QImage(rgb_image.data, w, h, w * ch, QImage.Format.Format_RGB888)
+                # 원본 크기 변환 없이 먼저 미리보기 크기로 줄임 (같은 버퍼 재사용)
+                buffer = self.preview_scaler.scale(frame)
                 
-                # 스케일링 최적화
-                scaled_pixmap = QPixmap.fromImage(qt_image).scaled(
-                    Config.PREVIEW_WIDTH,
-                    Config.PREVIEW_HEIGHT,
-                    Qt.AspectRatioMode.KeepAspectRatio,
-                    Qt.TransformationMode.FastTransformation  # 빠른 변환 사용
-                )
+                # BGR 버퍼를 직접 참조하는 QImage - 버퍼가 다시 할당될 때만 새로 생성
+                if self.preview_image is None or self.preview_image_buffer is not buffer:
+                    h, w, ch = buffer.shape
+                    self.preview_image = QImage(buffer.data, w, h, buffer.strides[0], QImage.Format.Format_BGR888)
+                    self.preview_image_buffer = buffer
                 
-                self.preview_frame.setPixmap(scaled_pixmap)
+                self.preview_frame.setPixmap(QPixmap.fromImage(self.preview_image))
+                
+                # 처리 시간과 움직임에 따라 표시 간격 조정
+                if self.pacer.record((time.perf_counter() - started) * 1000, buffer):
+                    self.apply_pacing()
+                if Config.PREVIEW_DEBUG:
+                    self.update_debug_overlay()
+    
+    def apply_pacing(self):
+        """현재 표시 fps를 타이머와 카메라 읽기 속도에 반영"""
+        self.timer.setInterval(self.pacer.interval_ms)
+        if self.camera:
+            # 유휴 상태에서는 카메라도 천천히 읽음
+            self.camera.throttle(self.pacer.idle_fps if self.pacer.idle else None)
+        logging.info(f"Preview pacing changed: {self.pacer.stats()}")
+    
+    def preview_stats(self):
+        """미리보기 성능 집계 (표시 fps, 처리 시간, 카메라 프레임 수)"""
+        stats = self.pacer.stats()
+        if self.camera:
+            stats.update(self.camera.stats())
+        return stats
+    
+    def update_debug_overlay(self):
+        """성능 수치 표시 갱신 (1초마다)"""
+        now = time.monotonic()
+        if now - self.debug_updated_at < 1.0:
+            return
+        self.debug_updated_at = now
+        stats = self.preview_stats()
+        self.debug_label.setText(
+            f"fps {stats['fps']} / {stats['target_fps']}{' (idle)' if stats['idle'] else ''}\n"
+            f"process p50 {stats['process_p50']}ms  p95 {stats['process_p95']}ms\n"
+            f"captured {stats.get('captured', 0)}  dropped {stats.get('dropped', 0)}  late {stats.get('late', 0)}"
+        )
+        self.debug_label.adjustSize()
     
     def capture_photo(self):
         """사진 촬영 (텍스트 메시지 고정)"""
@@ -180,11 +214,18 @@ class PhotoScreen(QWidget):
             """메시지 숨기기"""
             self.message_label.hide()
 
+        # 촬영 중에는 유휴 상태 해제
+        if self.pacer.wake():
+            self.apply_pacing()
+
         def take_photo():
             """사진 촬영"""
-            if self.camera and self.camera.isOpened():
-                ret, frame = self.camera.read()
-                if ret:
+            if self.camera and self.camera.is_opened():
+                # 카운트다운이 끝난 이후에 읽은 프레임 사용 (이전에 받아둔 프레임 사용 방지)
+                latest = self.camera.wait_for_frame(time.monotonic())
+                if latest is not None:
+                    frame = latest[2]
+                    
                     # 메시지 숨기기
                     hide_message()
 
@@ -217,6 +258,9 @@ class PhotoScreen(QWidget):
         super().hideEvent(event)
         if self.timer.isActive():
             self.timer.stop()
+        if self.camera:
+            logging.info(f"Camera preview stats: {self.preview_stats()}")
+            self.camera.stop()
     
     def show_error(self, message):
         """에러 메시지 표시"""
@@ -232,10 +276,14 @@ class PhotoScreen(QWidget):
             }
         """)
             
-    def closeEvent(self, event):
-        """프로그램 종료 시에만 카메라 해제"""
-        if self.camera and self.camera.isOpened():
-            self.timer.stop()
+    def release_camera(self):
+        """카메라 스레드 중지 및 해제"""
+        self.timer.stop()
+        if self.camera:
             self.camera.release()
             self.camera = None
+            
+    def closeEvent(self, event):
+        """프로그램 종료 시에만 카메라 해제"""
+        self.release_camera()
         event.accept()
\ No newline at end of file
@@ -0,0 +1,426 @@
+import argparse
+import io
+import itertools
+import json
+import logging
+import os
+import queue
+import re
+import shutil
+import threading
+import zipfile
+from datetime import datetime
+
+from PIL import Image
+from PIL.PngImagePlugin import PngInfo
+from config import Config
+from utils.files import write_atomic
+
+# 형식별 확장자와 PIL 저장 옵션
+ARCHIVE_FORMATS = {
+    'png': ('.png', 'PNG'),
+    'jpeg': ('.jpg', 'JPEG'),
+    'webp': ('.webp', 'WEBP'),
+}
+
+# Windows 파일 이름에 쓸 수 없는 문자와 제어 문자
+_UNSAFE_CHARS = re.compile(r'[<>:"/\\|?*\x00-\x1f]+')
+_RESERVED_NAMES = {'CON', 'PRN', 'AUX', 'NUL'} | {f'COM{i}' for i in range(1, 10)} | {f'LPT{i}' for i in range(1, 10)}
+
+
+def safe_filename(name, max_length=40):
+    """이름을 파일 이름에 쓸 수 있게 정리 (한글은 유지, 금지 문자는 '_'로 바꿈)"""
+    name = _UNSAFE_CHARS.sub('_', str(name)).strip(' .')
+    name = re.sub(r'\s+', '_', name)[:max_length].rstrip(' ._')
+    if not name or name.upper() in _RESERVED_NAMES:
+        name = f'_{name}'
+    return name
+
+
+def photo_path_for(card_path):
+    """카드 보관 경로에 대응하는 원본 사진 경로 (card_<...>.jpg -> photo_<...>.png)"""
+    directory, filename = os.path.split(card_path)
+    stem = os.path.splitext(filename)[0]
+    if stem.startswith('card_'):
+        stem = stem[len('card_'):]
+    return os.path.join(directory, f'photo_{stem}.png')
+
+
+def save_options(fmt=None, quality=None):
+    """보관 형식에 맞는 확장자와 PIL 저장 옵션 반환"""
+    fmt = (fmt or Config.ARCHIVE_FORMAT).lower()
+    if fmt not in ARCHIVE_FORMATS:
+        raise ValueError(f"알 수 없는 보관 형식: {fmt}")
+
+    quality = Config.ARCHIVE_QUALITY if quality is None else quality
+    extension, pil_format = ARCHIVE_FORMATS[fmt]
+    if pil_format == 'PNG':
+        options = {'format': pil_format, 'compress_level': 6}
+    elif pil_format == 'WEBP':
+        options = {'format': pil_format, 'quality': quality, 'method': 4}
+    else:
+        options = {'format': pil_format, 'quality': quality, 'subsampling': 0}
+    options['dpi'] = (Config.PRINTER_DPI, Config.PRINTER_DPI)
+    return extension, options
+
+
+INDEX_NAME = 'index.jsonl'
+ZIP_DIR = 'archives'
+_MONTH_DIR = re.compile(r'^\d{4}-\d{2}$')
+_LEGACY_TIMESTAMP = re.compile(r'_(\d{8})_\d{6}')
+
+
+def _month_offset(month, months):
+    """'YYYY-MM'에서 months개월 이전 달"""
+    year, month = map(int, month.split('-'))
+    index = year * 12 + month - 1 - months
+    return f'{index // 12:04d}-{index % 12 + 1:02d}'
+
+
+class ArchiveIndex:
+    """보관 폴더 색인 - (이름, 생년월일)로 카드/사진 경로를 바로 찾음
+
+    보관 파일은 OUTPUT_DIR/YYYY-MM/DD/ 에 저장하고, 오래된 달은 archives/YYYY-MM.zip 으로 묶는다.
+    색인(index.jsonl)에는 보관 폴더 기준 경로를 기록하며 zip 안의 파일은 'archives/YYYY-MM.zip!경로' 로 표시한다.
+    """
+
+    def __init__(self, output_dir=None):
+        self.output_dir = output_dir or Config.OUTPUT_DIR
+        self.path = os.path.join(self.output_dir, INDEX_NAME)
+        self._entries = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(name, birthdate):
+        return str(name).strip(), str(birthdate).strip()
+
+    def relative(self, path):
+        return os.path.relpath(path, self.output_dir).replace(os.sep, '/')
+
+    def _load(self):
+        if self._entries is None:
+            self._entries = {}
+            if os.path.exists(self.path):
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    for line in f:
+                        try:
+                            entry = json.loads(line)
+                        except ValueError:
+                            continue  # 전원 차단으로 잘린 마지막 줄
+                        self._entries.setdefault(self._key(entry['name'], entry['birthdate']), []).append(entry)
+        return self._entries
+
+    def add(self, name, birthdate, issued_at, card, photo=None):
+        """보관 파일 색인 추가 (경로는 보관 폴더 기준)"""
+        entry = {'name': name, 'birthdate': birthdate, 'issued_at': issued_at, 'card': card, 'photo': photo}
+        with self._lock:
+            entries = self._load()
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+            entries.setdefault(self._key(name, birthdate), []).append(entry)
+
+    def find(self, name, birthdate):
+        """해당 방문자의 보관 기록 (최근 발급 순)"""
+        with self._lock:
+            entries = self._load().get(self._key(name, birthdate), [])
+            return sorted(entries, key=lambda entry: entry['issued_at'], reverse=True)
+
+    def entries(self):
+        with self._lock:
+            return [entry for entries in self._load().values() for entry in entries]
+
+    def _rewrite(self, entries):
+        """색인 파일 전체를 다시 기록"""
+        write_atomic(self.path, lambda f: f.writelines(
+            (json.dumps(entry, ensure_ascii=False) + '\n').encode('utf-8') for entry in entries
+        ))
+        self._entries = {}
+        for entry in entries:
+            self._entries.setdefault(self._key(entry['name'], entry['birthdate']), []).append(entry)
+
+    def open_file(self, relative_path):
+        """색인 경로의 파일 열기 (zip 안의 파일도 지원) - 바이너리 파일 객체"""
+        if '!' in relative_path:
+            zip_path, member = relative_path.split('!', 1)
+            with zipfile.ZipFile(os.path.join(self.output_dir, zip_path)) as archive:
+                return io.BytesIO(archive.read(member))
+        return open(os.path.join(self.output_dir, relative_path), 'rb')
+
+    def open_image(self, relative_path):
+        """색인 경로의 이미지 읽기 (RGB)"""
+        with self.open_file(relative_path) as f, Image.open(f) as image:
+            return image.convert('RGB')
+
+    def _month_dirs(self):
+        return sorted(name for name in os.listdir(self.output_dir)
+                      if _MONTH_DIR.match(name) and os.path.isdir(os.path.join(self.output_dir, name)))
+
+    def _organize_legacy(self):
+        """이전 버전이 보관 폴더에 바로 저장한 파일을 날짜 폴더로 이동 - 이동한 수 반환"""
+        moved = 0
+        for filename in os.listdir(self.output_dir):
+            path = os.path.join(self.output_dir, filename)
+            if not (filename.startswith(('card_', 'photo_')) and os.path.isfile(path)) or filename.endswith('.tmp'):
+                continue
+            match = _LEGACY_TIMESTAMP.search(filename)
+            day = datetime.strptime(match.group(1), '%Y%m%d') if match else datetime.fromtimestamp(os.path.getmtime(path))
+            target_dir = os.path.join(self.output_dir, day.strftime('%Y-%m'), day.strftime('%d'))
+            os.makedirs(target_dir, exist_ok=True)
+            os.replace(path, os.path.join(target_dir, filename))
+            moved += 1
+        return moved
+
+    def rebuild(self):
+        """보관 폴더와 zip을 훑어 색인 다시 생성 - 색인 항목 수 반환
+
+        사진 파일의 텍스트 정보(이름, 생년월일, 발급 시각)를 사용하며,
+        사진 없이 카드만 있는 이전 파일은 파일 이름의 이름만으로 색인한다.
+        """
+        with self._lock:
+            self._organize_legacy()
+            files = []  # (색인 경로, 파일 이름, 파일 열기 함수)
+            for root, _, names in os.walk(self.output_dir):
+                if os.path.relpath(root, self.output_dir).split(os.sep)[0] == ZIP_DIR:
+                    continue
+                for filename in names:
+                    path = os.path.join(root, filename)
+                    files.append((self.relative(path), filename, lambda path=path: open(path, 'rb')))
+
+            zip_dir = os.path.join(self.output_dir, ZIP_DIR)
+            for zip_name in sorted(os.listdir(zip_dir)) if os.path.isdir(zip_dir) else []:
+                zip_path = os.path.join(zip_dir, zip_name)
+                with zipfile.ZipFile(zip_path) as archive:
+                    for member in archive.namelist():
+                        files.append((f'{ZIP_DIR}/{zip_name}!{member}', member.rsplit('/', 1)[-1],
+                                      lambda zip_path=zip_path, member=member: self._read_member(zip_path, member)))
+
+            cards = {}
+            for relative_path, filename, _ in files:
+                if filename.startswith('card_') and not filename.endswith('.tmp'):
+                    cards[(relative_path.rsplit('/', 1)[0], os.path.splitext(filename)[0][len('card_'):])] = relative_path
+
+            entries = []
+            for relative_path, filename, opener in files:
+                if not (filename.startswith('photo_') and filename.endswith('.png')):
+                    continue
+                try:
+                    with opener() as f, Image.open(f) as image:
+                        text = dict(image.text)
+                except OSError as e:
+                    logging.warning(f"Archived photo unreadable, skipping: {relative_path}: {e}")
+                    continue
+                card = cards.pop((relative_path.rsplit('/', 1)[0], filename[len('photo_'):-len('.png')]), None)
+                entries.append({'name': text.get('name', ''), 'birthdate': text.get('birthdate', ''),
+                                'issued_at': text.get('issued_at', ''), 'card': card, 'photo': relative_path})
+
+            # 사진이 없는 이전 카드 (card_<이름>_<YYYYmmdd_HHMMSS>)
+            for (_, stem), card in cards.items():
+                match = _LEGACY_TIMESTAMP.search(stem)
+                name = stem[:match.start()] if match else stem
+                issued_at = datetime.strptime(match.group(0)[1:], '%Y%m%d_%H%M%S').isoformat() if match else ''
+                entries.append({'name': name, 'birthdate': '', 'issued_at': issued_at, 'card': card, 'photo': None})
+
+            self._rewrite(entries)
+            return len(entries)
+
+    @staticmethod
+    def _read_member(zip_path, member):
+        with zipfile.ZipFile(zip_path) as archive:
+            return io.BytesIO(archive.read(member))
+
+    def _zip_month(self, month):
+        """한 달 폴더를 archives/YYYY-MM.zip 으로 묶음 (PNG만 압축, JPEG/WebP는 그대로 저장)
+
+        폴더는 지우지 않으므로 색인을 zip 경로로 바꿔 기록한 뒤 호출 측에서 삭제한다.
+        """
+        month_dir = os.path.join(self.output_dir, month)
+        zip_dir = os.path.join(self.output_dir, ZIP_DIR)
+        os.makedirs(zip_dir, exist_ok=True)
+        zip_path = os.path.join(zip_dir, f'{month}.zip')
+
+        with zipfile.ZipFile(zip_path, 'a') as archive:
+            existing = set(archive.namelist())
+            for root, _, names in os.walk(month_dir):
+                for filename in sorted(names):
+                    if filename.endswith('.tmp'):
+                        continue
+                    path = os.path.join(root, filename)
+                    member = self.relative(path)
+                    if member in existing:
+                        continue
+                    compression = zipfile.ZIP_DEFLATED if filename.endswith('.png') else zipfile.ZIP_STORED
+                    archive.write(path, member, compress_type=compression)
+        with open(zip_path, 'rb+') as f:
+            os.fsync(f.fileno())
+        return f'{ZIP_DIR}/{month}.zip'
+
+    def maintain(self):
+        """색인이 없으면 만들고 보관 정책 적용 (프로그램 시작 시 백그라운드에서 실행)"""
+        if not os.path.exists(self.path):
+            count = self.rebuild()
+            logging.info(f"Archive index rebuilt: {count} entries")
+        return self.apply_retention()
+
+    def apply_retention(self, keep_months=None, delete_after_months=None, now=None):
+        """보관 정책 적용 - 최근 keep_months개월은 파일 그대로 두고 이전 달은 zip으로 묶으며,
+        delete_after_months가 0보다 크면 그보다 오래된 zip은 삭제한다. (묶은 달, 삭제한 달) 반환
+        """
+        keep_months = Config.ARCHIVE_RETENTION_MONTHS if keep_months is None else keep_months
+        delete_after_months = Config.ARCHIVE_DELETE_AFTER_MONTHS if delete_after_months is None else delete_after_months
+        current = (now or datetime.now()).strftime('%Y-%m')
+        zip_before = _month_offset(current, keep_months - 1)
+
+        with self._lock:
+            entries = [entry for entries in self._load().values() for entry in entries]
+            if self._organize_legacy():
+                logging.info("Legacy archive files moved into date folders")
+
+            zipped = []
+            for month in self._month_dirs():
+                if month >= zip_before:
+                    continue
+                zip_path = self._zip_month(month)
+                zipped.append(month)
+                for entry in entries:
+                    for field in ('card', 'photo'):
+                        if entry[field] and entry[field].startswith(month + '/'):
+                            entry[field] = f'{zip_path}!{entry[field]}'
+
+            deleted = []
+            zip_dir = os.path.join(self.output_dir, ZIP_DIR)
+            if delete_after_months > 0 and os.path.isdir(zip_dir):
+                delete_before = _month_offset(current, delete_after_months - 1)
+                for zip_name in sorted(os.listdir(zip_dir)):
+                    month = zip_name[:-len('.zip')]
+                    if _MONTH_DIR.match(month) and month < delete_before:
+                        deleted.append(month)
+                removed = tuple(f'{ZIP_DIR}/{month}.zip!' for month in deleted)
+                entries = [entry for entry in entries if not (entry['card'] or entry['photo'] or '').startswith(removed)]
+
+            # 색인을 먼저 기록한 뒤 파일 삭제 (중간에 종료되어도 색인이 지워진 파일을 가리키지 않음)
+            if zipped or deleted:
+                self._rewrite(entries)
+            for month in zipped:
+                shutil.rmtree(os.path.join(self.output_dir, month))
+            for month in deleted:
+                os.remove(os.path.join(zip_dir, f'{month}.zip'))
+
+            if zipped or deleted:
+                logging.info(f"Archive retention applied: zipped {zipped}, deleted {deleted}")
+            return zipped, deleted
+
+
+class ArchiveWriter:
+    """카드 이미지를 별도 스레드에서 인코딩하여 보관 폴더에 저장
+
+    저장 경로는 요청 즉시 정해서 반환하므로 호출 측은 파일 기록을 기다리지 않고 출력을 시작할 수 있다.
+    """
+
+    def __init__(self, output_dir=None, fmt=None, quality=None, max_pending=16):
+        self.output_dir = output_dir or Config.OUTPUT_DIR
+        self.extension, self.options = save_options(fmt, quality)
+        self._counter = itertools.count(1)
+        self._queue = queue.Queue(maxsize=max_pending)  # 가득 차면 요청 측이 대기 (메모리 제한)
+        os.makedirs(self.output_dir, exist_ok=True)
+        self.index = ArchiveIndex(self.output_dir)
+
+        self._worker = threading.Thread(target=self._run, name='card-archive', daemon=True)
+        self._worker.start()
+
+    def next_path(self, name):
+        """같은 초에 여러 장을 발급해도 겹치지 않는 저장 경로 (YYYY-MM/DD 폴더)"""
+        now = datetime.now()
+        filename = f"card_{safe_filename(name)}_{now.strftime('%Y%m%d_%H%M%S_%f')}_{next(self._counter):04d}{self.extension}"
+        return os.path.join(self.output_dir, now.strftime('%Y-%m'), now.strftime('%d'), filename)
+
+    def submit(self, card, name, path=None, photo=None, metadata=None):
+        """카드 저장 요청 - 저장될 경로 반환
+
+        photo를 주면 디자인 변경 시 다시 만들 수 있도록 원본 사진도 무손실 PNG로 함께 보관하고,
+        metadata(이름, 생년월일 등)는 사진 파일의 텍스트 정보로 기록한다.
+        """
+        path = path or self.next_path(name)
+        self._queue.put((card, path, photo, metadata))
+        return path
+
+    def flush(self):
+        """대기 중인 저장이 모두 끝날 때까지 대기"""
+        self._queue.join()
+
+    def close(self):
+        """남은 저장을 마치고 스레드 종료"""
+        self._queue.put(None)
+        self._worker.join()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    break
+                card, path, photo, metadata = item
+                self._store(card, path, photo, metadata or {})
+            finally:
+                self._queue.task_done()
+
+    def _store(self, card, path, photo, metadata):
+        """카드(와 사진) 저장 후 색인에 추가"""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if not self._write(card, path):
+            return
+
+        photo_path = None
+        if photo is not None:
+            photo_path = photo_path_for(path)
+            if not self._write_photo(photo, photo_path, metadata):
+                photo_path = None
+
+        if metadata:
+            self.index.add(metadata.get('name', ''), metadata.get('birthdate', ''), metadata.get('issued_at', ''),
+                           self.index.relative(path), photo_path and self.index.relative(photo_path))
+
+    def _write_photo(self, photo, path, metadata):
+        info = PngInfo()
+        for key, value in metadata.items():
+            info.add_itxt(key, str(value))
+        return self._write(photo, path, format='PNG', compress_level=6, pnginfo=info)
+
+    def _write(self, card, path, **options):
+        try:
+            write_atomic(path, lambda f: card.save(f, **(options or self.options)))
+            return True
+        except Exception as e:
+            logging.error(f"Card archive write failed: {path}: {e}", exc_info=True)
+            return False
+
+
+def main():
+    """보관 폴더 관리 (src 폴더에서 python -m utils.archive 로 실행)"""
+    parser = argparse.ArgumentParser(description="발급 카드 보관 폴더 관리")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    find_parser = subparsers.add_parser('find', help="방문자의 보관 카드 찾기")
+    find_parser.add_argument('name')
+    find_parser.add_argument('birthdate', nargs='?', default='')
+
+    subparsers.add_parser('rebuild', help="보관 폴더를 훑어 색인 다시 생성")
+    subparsers.add_parser('retention', help="보관 정책 적용 (오래된 달 압축/삭제)")
+
+    args = parser.parse_args()
+    index = ArchiveIndex()
+
+    if args.command == 'find':
+        entries = index.find(args.name, args.birthdate)
+        for entry in entries:
+            print(f"{entry['issued_at']}  {entry['card']}")
+        if not entries:
+            print("보관된 카드가 없습니다")
+    elif args.command == 'rebuild':
+        print(f"색인 {index.rebuild()}건을 만들었습니다")
+    elif args.command == 'retention':
+        zipped, deleted = index.apply_retention()
+        print(f"압축: {', '.join(zipped) or '없음'} / 삭제: {', '.join(deleted) or '없음'}")
+
+
+if __name__ == "__main__":
+    main()
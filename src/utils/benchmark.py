@@ -0,0 +1,445 @@
+import argparse
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+import cv2
+from PIL import Image, ImageDraw
+from PyQt6.QtCore import Qt
+from config import Config
+from utils import photo as photo_ops
+from utils.archive import save_options
+from utils.camera import CameraCapture
+from utils.card_pdf import render_card_pdf
+from utils.card_printer import CardPrinter
+from utils.card_template import get_compiled_template
+from utils.excel import ExcelManager
+from utils.frame_sources import get_frame_source, synthetic_frame
+from utils.preview import PreviewPacer, PreviewScaler, percentile
+from utils.print_backends import FileSpoolBackend
+from utils.print_queue import PrintQueue
+from utils.registry import SQLiteRegistry, write_visitor_excel
+
+# 사진 편집 화면 기본값 (preview 400x457, 줌 슬라이더 40, 약간 회전)
+FRAME_SIZE = (400, 457)
+ZOOM = 4.0
+ROTATION = 5
+NAMES = {'text': '홍길동', 'text_long': 'Maximilian Alexander Montgomery-Smith'}
+
+
+def _stages(frame, dpi, spool_dir):
+    """측정할 단계 목록 - [(이름, 함수)], 각 단계 입력은 미리 준비"""
+    template = get_compiled_template(dpi)
+    image_rgb = photo_ops.to_rgb(frame)
+    rotated = photo_ops.rotate(image_rgb, ROTATION)
+    display = photo_ops.display_size((rotated.shape[1], rotated.shape[0]), FRAME_SIZE, ZOOM)
+    resized = cv2.resize(rotated, (int(display[0]), int(display[1])))
+    x1, y1, x2, y2 = photo_ops.crop_box(display, FRAME_SIZE, (0, 0))
+    cropped = Image.fromarray(resized[y1:y2, x1:x2])
+    photo = cropped.resize(photo_ops.print_photo_size(dpi), Image.Resampling.LANCZOS)
+    card = template.render({'name': NAMES['text']}, photo)
+    backend = FileSpoolBackend(spool_dir)
+    preview = PreviewScaler()
+
+    def composite():
+        base = template.base.copy()
+        x, y, _, _ = template.photo_box
+        base.paste(photo, (x, y))
+        return base
+
+    def draw_text(name):
+        draw = ImageDraw.Draw(card.copy())
+
+        def stage():
+            for slot in template.text_slots:
+                template._draw_text(draw, slot, name)
+        return stage
+
+    def encode(fmt):
+        _, options = save_options(fmt)
+
+        def stage():
+            card.save(io.BytesIO(), **options)
+        return stage
+
+    def print_file():
+        os.remove(backend.print_image(card))
+
+    return [
+        ('preview', lambda: preview.scale(frame)),
+        ('bgr_to_rgb', lambda: photo_ops.to_rgb(frame)),
+        ('rotate', lambda: photo_ops.rotate(image_rgb, ROTATION)),
+        ('resize', lambda: cv2.resize(rotated, (int(display[0]), int(display[1])))),
+        ('crop', lambda: Image.fromarray(resized[y1:y2, x1:x2])),
+        ('lanczos', lambda: cropped.resize(photo_ops.print_photo_size(dpi), Image.Resampling.LANCZOS)),
+        ('composite', composite),
+        ('text', draw_text(NAMES['text'])),
+        ('text_long', draw_text(NAMES['text_long'])),
+        ('encode_png', encode('png')),
+        ('encode_jpeg', encode('jpeg')),
+        ('encode_webp', encode('webp')),
+        ('print_file', print_file),
+        # 전체 경로 (편집 화면 크롭 -> 카드 합성)
+        ('crop_photo_total', lambda: photo_ops.crop_photo(frame, FRAME_SIZE, ROTATION, ZOOM, dpi=dpi)),
+        ('render_total', lambda: template.render({'name': NAMES['text']}, photo)),
+        ('render_pdf', lambda: render_card_pdf(NAMES['text'], '', photo, dpi)),
+    ]
+
+
+def measure(stage, iterations, warmup=3):
+    """단계 하나의 실행 시간(ms)과 할당량 측정
+
+    시간은 tracemalloc 없이 측정하고, 할당량은 별도로 한 번 실행하여 측정한다.
+    (PIL 이미지 버퍼는 tracemalloc에 잡히지 않으므로 numpy/파이썬 할당만 반영)
+    """
+    for _ in range(warmup):
+        stage()
+
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter_ns()
+        stage()
+        samples.append((time.perf_counter_ns() - start) / 1e6)
+    samples.sort()
+
+    tracemalloc.start()
+    try:
+        stage()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'p50_ms': round(percentile(samples, 50), 4),
+        'p95_ms': round(percentile(samples, 95), 4),
+        'mean_ms': round(statistics.fmean(samples), 4),
+        'peak_alloc_kb': round(peak / 1024, 1),
+    }
+
+
+def _git_commit():
+    try:
+        result = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=Config.BASE_DIR,
+                                capture_output=True, text=True, timeout=5)
+        return result.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def run(dpis=(300, 600), iterations=30, stages=None):
+    """DPI별로 모든 단계를 측정한 결과 반환"""
+    frame = synthetic_frame()
+    results = {
+        'meta': {
+            'commit': _git_commit(),
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'iterations': iterations,
+            'frame': [frame.shape[1], frame.shape[0]],
+        },
+        'results': {},
+    }
+
+    with tempfile.TemporaryDirectory() as spool_dir:
+        for dpi in dpis:
+            dpi_results = {}
+            for name, stage in _stages(frame, dpi, spool_dir):
+                if stages and name not in stages:
+                    continue
+                dpi_results[name] = measure(stage, iterations)
+            results['results'][str(dpi)] = dpi_results
+    return results
+
+
+def capture_load(seconds=10, source_name='synthetic'):
+    """프레임 입력 -> 캡처 스레드 -> 미리보기 축소 경로를 화면 없이 seconds초 동안 실행한 집계"""
+    camera = CameraCapture(get_frame_source(source_name))
+    if not camera.open():
+        raise RuntimeError(f"프레임 입력을 열 수 없습니다: {source_name}")
+
+    scaler = PreviewScaler()
+    pacer = PreviewPacer()
+    sequence = 0
+    camera.start()
+    try:
+        # 미리보기 타이머 대신 현재 표시 간격마다 최신 프레임 처리
+        end = time.monotonic() + seconds
+        while time.monotonic() < end:
+            time.sleep(pacer.interval_ms / 1000)
+            latest = camera.latest(sequence)
+            if latest is None:
+                continue
+            sequence, _, frame = latest
+            start = time.perf_counter()
+            preview = scaler.scale(frame)
+            if pacer.record((time.perf_counter() - start) * 1000, preview):
+                camera.throttle(pacer.idle_fps if pacer.idle else None)
+        return {'source': source_name, 'seconds': seconds, **pacer.stats(), **camera.stats()}
+    finally:
+        camera.release()
+
+
+@contextlib.contextmanager
+def _scratch_data_dir():
+    """실제 방문자/출력 데이터 대신 임시 폴더를 쓰도록 Config 경로를 바꾼 뒤 복원"""
+    paths = {
+        'DATA_DIR': '',
+        'EXCEL_PATH': 'visitors.xlsx',
+        'JOURNAL_PATH': 'visitors.journal.jsonl',
+        'DB_PATH': 'visitors.db',
+        'SHARD_DIR': 'shards',
+        'OUTPUT_DIR': 'output',
+        'PRINT_SPOOL_DIR': 'spool',
+        'FILE_PRINTER_DIR': 'file_printer',
+    }
+    saved = {name: getattr(Config, name) for name in list(paths) + ['SHARED_REGISTRY_DIR', 'REGISTRY_BACKEND']}
+    with tempfile.TemporaryDirectory() as directory:
+        for name, relative in paths.items():
+            setattr(Config, name, os.path.join(directory, relative) if relative else directory)
+        Config.SHARED_REGISTRY_DIR = ''
+        Config.REGISTRY_BACKEND = 'excel'
+        Config.initialize_directories()
+        try:
+            yield directory
+        finally:
+            for name, value in saved.items():
+                setattr(Config, name, value)
+
+
+def _visitor_rows(count, start=0):
+    return [(f'방문자{i:07d}', f'{1950 + i % 60}{1 + i % 12:02d}{1 + i % 28:02d}', '2025-01-01 09:00:00')
+            for i in range(start, start + count)]
+
+
+def lookup_scaling(sizes=(100, 1000, 10000, 100000), iterations=2000):
+    """visitors.xlsx 행 수별 중복 체크 시간 - 인덱스 생성 후 조회 시간이 행 수와 관계없이 일정한지 확인"""
+    results = []
+    for size in sizes:
+        with _scratch_data_dir():
+            rows = _visitor_rows(size)
+            write_visitor_excel(Config.EXCEL_PATH, [rows], size)
+
+            ExcelManager._index = None
+            start = time.perf_counter()
+            ExcelManager.build_index()
+            build_seconds = time.perf_counter() - start
+
+            hit = rows[size // 2][:2]
+            hit_stat = measure(lambda: ExcelManager.check_duplicate(*hit), iterations)
+            miss_stat = measure(lambda: ExcelManager.check_duplicate('없는 방문자', '19000101'), iterations)
+            assert ExcelManager.check_duplicate(*hit)
+            ExcelManager._index = None
+
+        results.append({
+            'rows': size,
+            'build_s': round(build_seconds, 3),
+            'hit_p50_us': round(hit_stat['p50_ms'] * 1000, 1),
+            'hit_p95_us': round(hit_stat['p95_ms'] * 1000, 1),
+            'miss_p50_us': round(miss_stat['p50_ms'] * 1000, 1),
+            'miss_p95_us': round(miss_stat['p95_ms'] * 1000, 1),
+        })
+    return results
+
+
+def _peak_rss_mb():
+    """현재 프로세스의 최대 메모리 사용량 (MB)"""
+    try:
+        import resource
+    except ImportError:
+        # Windows - PeakWorkingSetSize
+        import ctypes
+        from ctypes import wintypes
+
+        class ProcessMemoryCounters(ctypes.Structure):
+            _fields_ = [('cb', wintypes.DWORD), ('PageFaultCount', wintypes.DWORD)] + [
+                (name, ctypes.c_size_t) for name in (
+                    'PeakWorkingSetSize', 'WorkingSetSize', 'QuotaPeakPagedPoolUsage', 'QuotaPagedPoolUsage',
+                    'QuotaPeakNonPagedPoolUsage', 'QuotaNonPagedPoolUsage', 'PagefileUsage', 'PeakPagefileUsage')]
+
+        counters = ProcessMemoryCounters()
+        counters.cb = ctypes.sizeof(counters)
+        ctypes.windll.psapi.GetProcessMemoryInfo(ctypes.windll.kernel32.GetCurrentProcess(),
+                                                 ctypes.byref(counters), counters.cb)
+        return counters.PeakWorkingSetSize / 1024 / 1024
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux는 KB, macOS는 바이트 단위
+    return peak / 1024 / 1024 if sys.platform == 'darwin' else peak / 1024
+
+
+def _export_child(db_path, excel_path, results):
+    """새 프로세스에서 내보내기만 실행 (최대 메모리 사용량이 DB 생성 등 다른 작업의 영향을 받지 않도록)"""
+    registry = SQLiteRegistry(db_path)
+    baseline = _peak_rss_mb()
+    start = time.perf_counter()
+    count = registry.export_excel(excel_path)
+    seconds = time.perf_counter() - start
+    registry.close()
+    results.put({'rows': count, 'seconds': round(seconds, 2), 'baseline_rss_mb': round(baseline, 1),
+                 'peak_rss_mb': round(_peak_rss_mb(), 1), 'file_mb': round(os.path.getsize(excel_path) / 1024 / 1024, 1)})
+
+
+def export_memory(sizes=(200000,)):
+    """방문자 수별 엑셀 내보내기 시간과 최대 메모리 사용량 (행 수가 늘어도 메모리가 일정한지 확인)"""
+    context = multiprocessing.get_context('spawn')
+    results = []
+    for size in sizes:
+        with _scratch_data_dir():
+            registry = SQLiteRegistry(Config.DB_PATH)
+            for start in range(0, size, 10000):
+                registry.add_many(_visitor_rows(min(10000, size - start), start))
+            registry.close()
+
+            queue = context.Queue()
+            process = context.Process(target=_export_child, args=(Config.DB_PATH, Config.EXCEL_PATH, queue))
+            process.start()
+            result = queue.get()
+            process.join()
+        result['export_rss_mb'] = round(result['peak_rss_mb'] - result['baseline_rss_mb'], 1)
+        results.append(result)
+    return results
+
+
+def print_queue_throughput(jobs=50, dpi=None):
+    """파일 출력(가상 프린터)으로 출력 대기열 처리량 측정
+
+    작업 추가 시간(UI 스레드가 기다리는 시간), 작업별 추가~스풀 저장/완료 시간, 전체 처리량을 반환한다.
+    """
+    photo = photo_ops.crop_photo(synthetic_frame(), FRAME_SIZE, ROTATION, ZOOM, dpi=dpi)
+    submitted = {}
+    saved = {}
+    finished = {}
+    failed = []
+
+    # 작업 스레드가 submit 반환 전에 알릴 수도 있으므로 시각만 기록하고 나중에 계산
+    def on_saved(job_id, success, detail):
+        saved[job_id] = time.perf_counter()
+        if not success:
+            failed.append(detail)
+
+    def on_finished(job_id, success, detail):
+        finished[job_id] = time.perf_counter()
+        if not success:
+            failed.append(detail)
+
+    with _scratch_data_dir():
+        printer = CardPrinter(FileSpoolBackend(Config.FILE_PRINTER_DIR))
+        print_queue = PrintQueue(printer=printer)
+        # 이벤트 루프 없이 작업 스레드에서 바로 호출
+        print_queue.job_saved.connect(on_saved, Qt.ConnectionType.DirectConnection)
+        print_queue.job_finished.connect(on_finished, Qt.ConnectionType.DirectConnection)
+
+        submit_ms = []
+        start = time.perf_counter()
+        for i in range(jobs):
+            submit_start = time.perf_counter()
+            job_id = print_queue.submit(f'방문자{i}', '19900101', photo)
+            submit_ms.append((time.perf_counter() - submit_start) * 1000)
+            submitted[job_id] = submit_start
+        print_queue.wait_idle()
+        seconds = time.perf_counter() - start
+        print_queue.stop()
+        printed = len(os.listdir(Config.FILE_PRINTER_DIR))
+
+    submit_ms.sort()
+    saved_ms = sorted((saved[job_id] - submitted[job_id]) * 1000 for job_id in saved)
+    latencies = sorted(finished[job_id] - submitted[job_id] for job_id in finished)
+    return {
+        'jobs': jobs,
+        'printed': printed,
+        'failed': len(failed),
+        'seconds': round(seconds, 2),
+        'jobs_per_second': round(jobs / seconds, 1),
+        'submit_p50_ms': round(percentile(submit_ms, 50), 2),
+        'submit_p95_ms': round(percentile(submit_ms, 95), 2),
+        'saved_p50_ms': round(percentile(saved_ms, 50), 1),
+        'saved_p95_ms': round(percentile(saved_ms, 95), 1),
+        'latency_p50_s': round(percentile(latencies, 50), 2),
+        'latency_p95_s': round(percentile(latencies, 95), 2),
+    }
+
+
+def print_table(rows):
+    """결과 목록을 표로 출력"""
+    widths = {column: max(12, len(column) + 2) for column in rows[0]}
+    print(''.join(f'{column:>{width}}' for column, width in widths.items()))
+    for row in rows:
+        print(''.join(f'{row[column]!s:>{width}}' for column, width in widths.items()))
+
+
+def print_report(results, baseline=None):
+    """결과 표 출력 (baseline이 있으면 p50 변화율 함께 표시)"""
+    for dpi, stages in results['results'].items():
+        print(f"\n[{dpi} DPI]")
+        print(f"{'stage':<18}{'p50 ms':>10}{'p95 ms':>10}{'alloc KB':>11}{'Δp50':>9}")
+        for name, stat in stages.items():
+            delta = ''
+            previous = (baseline or {}).get('results', {}).get(dpi, {}).get(name)
+            if previous and previous['p50_ms']:
+                delta = f"{(stat['p50_ms'] / previous['p50_ms'] - 1) * 100:+.0f}%"
+            print(f"{name:<18}{stat['p50_ms']:>10.3f}{stat['p95_ms']:>10.3f}{stat['peak_alloc_kb']:>11.1f}{delta:>9}")
+
+
+def main():
+    """카드 생성 단계별 성능 측정 (src 폴더에서 python -m utils.benchmark 로 실행)"""
+    parser = argparse.ArgumentParser(description="카드 생성 단계별 성능 측정")
+    parser.add_argument('--dpi', type=int, nargs='+', default=[300, 600])
+    parser.add_argument('--iterations', type=int, default=30)
+    parser.add_argument('--stage', action='append', help="특정 단계만 측정 (여러 번 지정 가능)")
+    parser.add_argument('--output', default='benchmark.json', help="결과 JSON 저장 경로")
+    parser.add_argument('--compare', help="비교할 이전 결과 JSON")
+    parser.add_argument('--lookup', type=int, nargs='*', metavar='ROWS',
+                        help="카드 단계 대신 방문자 수별 중복 체크 시간 측정 (기본: 100 1000 10000 100000)")
+    parser.add_argument('--export', type=int, nargs='*', metavar='ROWS',
+                        help="카드 단계 대신 방문자 수별 엑셀 내보내기 시간과 최대 메모리 측정 (기본: 200000)")
+    parser.add_argument('--print-queue', type=int, metavar='JOBS',
+                        help="카드 단계 대신 파일 출력으로 출력 대기열 처리량 측정 (작업 JOBS개)")
+    parser.add_argument('--capture', type=float, metavar='SECONDS',
+                        help="카드 단계 대신 캡처/미리보기 경로를 지정한 시간 동안 실행 (CARD_FRAME_SOURCE, 기본 synthetic)")
+    args = parser.parse_args()
+
+    if args.lookup is not None:
+        print_table(lookup_scaling(args.lookup or (100, 1000, 10000, 100000)))
+        return
+
+    if args.export is not None:
+        print_table(export_memory(args.export or (200000,)))
+        return
+
+    if args.print_queue:
+        print_table([print_queue_throughput(args.print_queue, args.dpi[0])])
+        return
+
+    if args.capture:
+        source_name = os.environ.get('CARD_FRAME_SOURCE', 'synthetic')
+        result = capture_load(args.capture, source_name)
+        for key, value in result.items():
+            print(f"{key:<14}{value}")
+        return
+
+    results = run(args.dpi, args.iterations, args.stage)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+    print_report(results, baseline)
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+    print(f"\n결과 저장: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+import logging
+import threading
+import time
+
+from config import Config
+from utils.frame_sources import get_frame_source
+
+
+class CameraCapture:
+    """전용 스레드에서 프레임 입력(카메라 등)을 계속 읽어 가장 최근 프레임 한 장만 보관
+
+    UI는 read() 대기 없이 최신 프레임을 가져가고, 가져가기 전에 새 프레임으로 덮인 프레임은
+    dropped, 가져갈 때 이미 한 프레임 주기 이상 지난 프레임은 late로 집계한다.
+    """
+
+    def __init__(self, source=None):
+        self.source = source
+        self.capture = None
+        self.frame_interval = 1.0 / Config.CAMERA_FPS
+        self.read_interval = 0.0  # 0이면 카메라 속도 그대로 읽음
+
+        self._cond = threading.Condition()
+        self._frame = None
+        self._timestamp = 0.0
+        self._sequence = 0
+        self._delivered_sequence = 0
+        self._running = False
+        self._thread = None
+        self._wake = threading.Event()
+
+        # 백그라운드 열기 상태 - 열기가 끝나기 전에 들어온 start/release는 끝난 뒤 처리
+        self._lock = threading.Lock()
+        self._open_thread = None
+        self._start_pending = False
+        self._release_pending = False
+        self._reset_counters()
+
+    def _reset_counters(self):
+        self._counters = {'captured': 0, 'delivered': 0, 'dropped': 0, 'late': 0, 'failures': 0}
+        self._started_at = time.monotonic()
+
+    def open(self):
+        """프레임 입력 열기 (Config.FRAME_SOURCE) - 성공 여부 반환"""
+        logging.info("카메라 초기화 시작...")
+        try:
+            source = self.source or get_frame_source()
+            if not source.open():
+                return False
+
+            self.source = source
+            self.capture = source
+            self.frame_interval = 1.0 / source.fps
+            logging.info("카메라 초기화 완료")
+            return True
+        except Exception as e:
+            logging.error(f"카메라 초기화 오류: {str(e)}")
+            return False
+
+    def open_async(self):
+        """백그라운드 스레드에서 열기 (장치 협상과 워밍업 동안 화면을 막지 않음)"""
+        with self._lock:
+            if self.is_opened() or self.is_opening():
+                return
+            self._release_pending = False
+            self._open_thread = threading.Thread(target=self._open_in_background, name='camera-open', daemon=True)
+            self._open_thread.start()
+
+    def _open_in_background(self):
+        opened = self.open()
+        with self._lock:
+            self._open_thread = None
+            if self._release_pending:
+                self._release_pending = False
+                self._release_source()
+            elif opened and self._start_pending:
+                self._start_pending = False
+                self._start_thread()
+
+    def is_opening(self):
+        return self._open_thread is not None
+
+    def wait_until_open(self, timeout=None):
+        """백그라운드 열기가 끝날 때까지 대기 - 열렸으면 True"""
+        thread = self._open_thread
+        if thread is not None:
+            thread.join(timeout)
+        return self.is_opened()
+
+    def is_opened(self):
+        return self.capture is not None and self.capture.isOpened()
+
+    def start(self):
+        """프레임 읽기 스레드 시작 (열리는 중이면 열린 직후 시작)"""
+        with self._lock:
+            if self.is_opening():
+                self._start_pending = True
+                return
+            self._start_thread()
+
+    def _start_thread(self):
+        if self._running or not self.is_opened():
+            return
+        # 이전 스레드가 read()에 묶여 아직 끝나지 않았으면 두 스레드가 같은 장치를 읽지 않도록 시작하지 않음
+        # (스레드는 끝날 때 스스로 _thread를 비우므로 잠금을 잡은 채 기다리지 않음)
+        if self._thread is not None:
+            logging.warning("이전 카메라 스레드가 종료되지 않아 시작하지 않습니다")
+            return
+        self._running = True
+        self._reset_counters()
+        self._thread = threading.Thread(target=self._run, name='camera-capture', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """프레임 읽기 스레드 중지 (카메라는 열어 둠)"""
+        self._start_pending = False
+        self._running = False
+        self._wake.set()
+        if not self._join_thread():
+            logging.warning("카메라 스레드가 1초 안에 종료되지 않았습니다")
+
+    def _join_thread(self, timeout=1.0):
+        """읽기 스레드 종료 대기 - 끝났으면 True (참조는 스레드가 끝날 때 비움)"""
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+            return not thread.is_alive()
+        return True
+
+    def throttle(self, fps=None):
+        """초당 fps장까지만 프레임 읽기 (None이면 제한 해제) - 카메라 앞이 비어 있을 때 사용"""
+        self.read_interval = 1.0 / fps if fps else 0.0
+        self._wake.set()
+
+    def release(self):
+        """스레드 중지 후 카메라 해제 (열리는 중이면 열린 직후, 읽기 스레드가 read()에 묶여 있으면 끝난 직후 해제)"""
+        self.stop()
+        with self._lock:
+            if self.is_opening() or self._thread is not None:
+                self._release_pending = True
+                return
+            self._release_source()
+
+    def _release_source(self):
+        if self.capture is not None:
+            self.capture.release()
+            self.capture = None
+
+    def _run(self):
+        try:
+            self._read_frames()
+        finally:
+            with self._lock:
+                self._thread = None
+                if self._release_pending and not self.is_opening():
+                    self._release_pending = False
+                    self._release_source()
+
+    def _read_frames(self):
+        while self._running:
+            ok, frame = self.capture.read()
+            now = time.monotonic()
+            if not ok:
+                self._counters['failures'] += 1
+                time.sleep(self.frame_interval)
+                continue
+
+            with self._cond:
+                if self._sequence > self._delivered_sequence and self._frame is not None:
+                    self._counters['dropped'] += 1
+                self._frame = frame
+                self._timestamp = now
+                self._sequence += 1
+                self._counters['captured'] += 1
+                self._cond.notify_all()
+
+            if self.read_interval:
+                self._wake.wait(self.read_interval - (time.monotonic() - now))
+                self._wake.clear()
+
+    def latest(self, after_sequence=0):
+        """after_sequence 이후의 최신 프레임 - (번호, 시각, 프레임), 새 프레임이 없으면 None"""
+        with self._cond:
+            if self._frame is None or self._sequence <= after_sequence:
+                return None
+            return self._deliver()
+
+    def wait_for_frame(self, after_time, timeout=1.0):
+        """after_time(time.monotonic) 이후에 읽은 프레임을 기다려 반환 - 시간 초과 시 None
+
+        촬영 시 카운트다운 전에 버퍼에 남아 있던 프레임이 아닌, 촬영 순간 이후 프레임을 얻기 위해 사용
+        """
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while self._frame is None or self._timestamp < after_time:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not self._running:
+                    return None
+                self._cond.wait(remaining)
+            return self._deliver()
+
+    def _deliver(self):
+        if time.monotonic() - self._timestamp > max(self.frame_interval, self.read_interval) * 1.5:
+            self._counters['late'] += 1
+        self._counters['delivered'] += 1
+        self._delivered_sequence = self._sequence
+        return self._sequence, self._timestamp, self._frame
+
+    def stats(self):
+        """프레임 집계 - captured, delivered, dropped, late, failures, capture_fps"""
+        with self._cond:
+            stats = dict(self._counters)
+        elapsed = time.monotonic() - self._started_at
+        stats['capture_fps'] = round(stats['captured'] / elapsed, 1) if elapsed > 0 else 0.0
+        return stats
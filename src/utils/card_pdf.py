@@ -0,0 +1,135 @@
+import io
+import logging
+import os
+import threading
+
+from PIL import Image, ImageColor
+from config import Config
+from utils.card_template import get_compiled_template, layout_text, text_slot
+from utils.fonts import FontRegistry
+from utils.photo import resize
+
+# 벡터 글자 배치 계산용 해상도 (1 dot = 0.1pt)
+MEASURE_DPI = 720
+PDF_FONT_NAME = 'CardFont'
+
+_font_lock = threading.Lock()
+_font_registered = None
+_fallback_warned = False
+
+
+def _mm_to_pt(mm):
+    return mm * 72 / 25.4
+
+
+def _px_to_pt(px):
+    return px * 72 / MEASURE_DPI
+
+
+def has_vector_pdf():
+    """reportlab 설치 여부 (없으면 PDF도 래스터 이미지로 생성)"""
+    try:
+        import reportlab  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def _register_font():
+    """카드 폰트를 PDF용으로 한 번만 등록 - 등록한 폰트 이름 반환"""
+    global _font_registered
+    with _font_lock:
+        if _font_registered is None:
+            from reportlab.pdfbase import pdfmetrics
+            from reportlab.pdfbase.ttfonts import TTFont
+
+            font_path = FontRegistry.resolve_font_path()
+            if font_path is None:
+                _font_registered = 'Helvetica'
+            else:
+                options = {'subfontIndex': 0} if font_path.lower().endswith('.ttc') else {}
+                pdfmetrics.registerFont(TTFont(PDF_FONT_NAME, font_path, **options))
+                _font_registered = PDF_FONT_NAME
+        return _font_registered
+
+
+def _jpeg_reader(image, width_mm, height_mm):
+    """이미지를 PDF_IMAGE_DPI 이하로 줄이고 JPEG로 압축한 ImageReader"""
+    from reportlab.lib.utils import ImageReader
+
+    size = (int(width_mm * Config.PDF_IMAGE_DPI / 25.4), int(height_mm * Config.PDF_IMAGE_DPI / 25.4))
+    image = image.convert('RGB')
+    if image.width > size[0] or image.height > size[1]:
+        image = resize(image, size)
+    buffer = io.BytesIO()
+    image.save(buffer, format='JPEG', quality=Config.PDF_IMAGE_QUALITY)
+    buffer.seek(0)
+    return ImageReader(buffer)
+
+
+def _vector_pdf(values, photo):
+    """글자는 벡터(사용한 글자만 담은 폰트 subset), 사진/배경만 이미지로 넣은 카드 PDF"""
+    from reportlab import rl_config
+    from reportlab.pdfgen import canvas
+
+    # 이미지/폰트 스트림을 ASCII85로 늘리지 않고 바이너리 그대로 저장
+    rl_config.useA85 = 0
+
+    template = get_compiled_template().template
+    page_width, page_height = _mm_to_pt(template['width']), _mm_to_pt(template['height'])
+    font_name = _register_font()
+
+    buffer = io.BytesIO()
+    pdf = canvas.Canvas(buffer, pagesize=(page_width, page_height))
+    pdf.setTitle('명예군민증')
+
+    if template.get('background'):
+        with Image.open(os.path.join(Config.RESOURCES_DIR, template['background'])) as background:
+            reader = _jpeg_reader(background, template['width'], template['height'])
+        pdf.drawImage(reader, 0, 0, page_width, page_height)
+
+    # PDF 좌표는 좌하단 기준
+    box = template['photo']
+    pdf.drawImage(_jpeg_reader(photo, box['width'], box['height']),
+                  _mm_to_pt(box['x']), page_height - _mm_to_pt(box['y'] + box['height']),
+                  _mm_to_pt(box['width']), _mm_to_pt(box['height']))
+
+    for text in template.get('texts', []):
+        slot = text_slot(template, text, MEASURE_DPI)
+        value = values.get(slot['field'], '') if slot['field'] else text.get('text', '')
+        placements, size = layout_text(slot, value)
+        if not placements:
+            continue
+
+        # 래스터와 같은 배치 - y는 글자 윗부분 기준이므로 기준선(ascent만큼 아래)으로 변환
+        ascent = FontRegistry.get_font(size).getmetrics()[0]
+        red, green, blue = ImageColor.getrgb(slot['fill'])[:3]
+        pdf.setFillColorRGB(red / 255, green / 255, blue / 255)
+        pdf.setFont(font_name, _px_to_pt(size))
+        for line, x, y in placements:
+            pdf.drawString(_px_to_pt(x), page_height - _px_to_pt(y + ascent), line)
+
+    pdf.showPage()
+    pdf.save()
+    return buffer.getvalue()
+
+
+def _raster_pdf(values, photo, dpi):
+    """카드 이미지를 그대로 넣은 PDF (reportlab이 없을 때)"""
+    card = get_compiled_template(dpi).render(values, photo)
+    buffer = io.BytesIO()
+    card.save(buffer, format='PDF', resolution=dpi)
+    return buffer.getvalue()
+
+
+def render_card_pdf(name, birthdate, photo, dpi=None):
+    """카드 한 장을 PDF(bytes)로 생성 - reportlab이 있으면 글자를 벡터로 넣음"""
+    global _fallback_warned
+    values = {'name': name, 'birthdate': birthdate}
+    if has_vector_pdf():
+        return _vector_pdf(values, photo)
+
+    if not _fallback_warned:
+        _fallback_warned = True
+        logging.warning("reportlab이 설치되어 있지 않아 카드 이미지를 넣은 PDF로 출력합니다")
+    return _raster_pdf(values, photo, dpi or Config.PRINTER_DPI)
@@ -1,12 +1,20 @@
-from PIL import Image, ImageDraw, ImageFont, ImageWin
 import os
 from datetime import datetime
-import win32print
-import win32ui
 from config import Config
+from utils.archive import ArchiveWriter
+from utils.card_pdf import render_card_pdf
+from utils.card_template import get_compiled_template
+from utils.fonts import DEFAULT_FONT_SIZE, FontRegistry
+from utils.imposition import SheetLayout, print_sheets, save_pdf
+from utils.print_backends import get_print_backend
+
+def render_card(name, birthdate, photo, dpi=None):
+    """카드 이미지 생성 (프린터 없이 사용 가능)"""
+    template = get_compiled_template(dpi)
+    return template.render({'name': name, 'birthdate': birthdate}, photo)
 
 class CardPrinter:
-    def __init__(self):
+    def __init__(self, backend=None):
         os.makedirs(Config.OUTPUT_DIR, exist_ok=True)
         
         # 프린터 설정값 (300DPI 기준)
@@ -14,104 +22,75 @@ class CardPrinter:
         self.CARD_WIDTH_MM = Config.CARD_WIDTH
         self.CARD_HEIGHT_MM = Config.CARD_HEIGHT
         
-        # mm를 dots로 변환
-        self.width_dots = int(self.CARD_WIDTH_MM * self.PRINTER_DPI / 25.4)
-        self.height_dots = int(self.CARD_HEIGHT_MM * self.PRINTER_DPI / 25.4)
-        
         # 폰트 설정 - Windows 시스템 폰트 사용
         self.FONT_NAME = "malgun gothic"  # 맑은고딕
-        self.FONT_SIZE = int(16 * self.PRINTER_DPI / 72)  # 11pt를 DPI에 맞게 변환
+        self.FONT_SIZE = DEFAULT_FONT_SIZE
+        
+        # 카드 디자인 (고정 요소는 한 번만 그려둠)
+        self.template = get_compiled_template(self.PRINTER_DPI)
+        
+        # 카드 크기 (dots)
+        self.width_dots, self.height_dots = self.template.size
+        
+        # 출력 방식 (Win32, lpr, 파일)
+        self.backend = backend or get_print_backend()
+        
+        # 보관용 이미지는 별도 스레드에서 저장 (출력을 기다리게 하지 않음)
+        self.archive = ArchiveWriter(Config.OUTPUT_DIR)
+        
+    def render(self, name, birthdate, photo):
+        """카드 이미지 생성"""
+        return render_card(name, birthdate, photo, self.PRINTER_DPI)
+    
+    def save_card(self, card, name, output_path=None, birthdate=None, photo=None):
+        """카드 이미지 보관용 저장 요청 - 저장될 경로 반환 (기록은 백그라운드에서 진행)
+
+        photo를 주면 디자인 변경 시 다시 만들 수 있도록 원본 사진도 함께 보관
+        """
+        metadata = {'name': name, 'birthdate': birthdate or '', 'issued_at': datetime.now().isoformat(timespec='seconds')}
+        return self.archive.submit(card, name, output_path, photo, metadata)
+    
+    def print_image(self, card):
+        """카드 이미지 출력"""
+        self.backend.print_image(card)
+    
+    def print_batch(self, cards, layout=None, pdf_path=None):
+        """카드 여러 장을 용지에 N장씩 배치하여 출력 (pdf_path 지정 시 PDF로 저장) - 용지 수 반환"""
+        layout = layout or SheetLayout(dpi=self.PRINTER_DPI, card_size=(self.CARD_WIDTH_MM, self.CARD_HEIGHT_MM))
+        if pdf_path:
+            return save_pdf(cards, pdf_path, layout)
+        return print_sheets(cards, self.backend, layout)
+    
+    def print_output(self, card, name, birthdate, photo):
+        """설정된 형식으로 출력 - PDF 형식이고 출력 방식이 PDF를 받으면 벡터 PDF, 아니면 카드 이미지"""
+        if Config.PRINT_FORMAT == 'pdf' and photo is not None and hasattr(self.backend, 'print_pdf'):
+            self.backend.print_pdf(render_card_pdf(name, birthdate, photo, self.PRINTER_DPI))
+        else:
+            self.print_image(card)
+    
+    def printer_status(self):
+        """마지막으로 확인한 프린터 상태 - (사용 가능 여부, 안내 문구)"""
+        return self.backend.status()
+    
+    def refresh_printer_status(self):
+        """프린터 상태 다시 조회"""
+        return self.backend.refresh_status()
+    
+    def close(self):
+        """보관 이미지 저장을 마치고 프린터 연결 종료"""
+        self.archive.close()
+        self.backend.close()
         
     def print_card(self, name, birthdate, photo):
         try:
-            # 1. 빈 흰색 카드 생성
-            card = Image.new('RGB', (self.width_dots, self.height_dots), 'white')
-            
-            # 카드와 사진의 실제 픽셀 크기 계산
-            card_width_px = int(self.CARD_WIDTH_MM * self.PRINTER_DPI / 25.4)
-            photo_width_px = int(Config.PHOTO_WIDTH * self.PRINTER_DPI / 25.4)
-            photo_height_px = int(Config.PHOTO_HEIGHT * self.PRINTER_DPI / 25.4)
-            
-            # 사진 리사이즈
-            photo = photo.resize((photo_width_px, photo_height_px), Image.Resampling.LANCZOS)
-            
-            # 정확한 중앙 위치 계산
-            margin_x = (card_width_px - photo_width_px) // 2 - 20
-            card_height_px = int(self.CARD_HEIGHT_MM * self.PRINTER_DPI / 25.4)
-            image_y = int(card_height_px * 0.20)  # 이미지를 상단에서 약 20% 지점에 위치
-
-            # 이미지 붙이기
-            card.paste(photo, (margin_x, image_y))
-            
-            # 2. 텍스트 추가
-            draw = ImageDraw.Draw(card)
-            
-            # 폰트 설정 - 직접 경로 사용
-            font = None
-            font_paths = [
-                "C:/Windows/Fonts/malgun.ttf",      # 맑은 고딕 일반
-                "C:/Windows/Fonts/MALGUN.TTF",      # 대문자로 시도
-                "C:/Windows/Fonts/msgothic.ttc",    # MS Gothic
-                "C:/Windows/Fonts/gulim.ttc"        # 굴림
-            ]
-            
-            for font_path in font_paths:
-                try:
-                    if os.path.exists(font_path):
-                        font = ImageFont.truetype(font_path, self.FONT_SIZE)
-                        print(f"폰트 로드 성공: {font_path}")
-                        break
-                except Exception as e:
-                    print(f"폰트 로드 실패 ({font_path}): {str(e)}")
-                    continue
-            
-            if font is None:
-                print("모든 폰트 로드 실패, 기본 폰트 사용")
-                font = ImageFont.load_default()
-            
-            # 텍스트 너비 계산
-            name_bbox = draw.textbbox((0, 0), name, font=font)
-            name_width = name_bbox[2] - name_bbox[0]
-            
-            birth_bbox = draw.textbbox((0, 0), birthdate, font=font)
-            birth_width = birth_bbox[2] - birth_bbox[0]
-            
-            # 텍스트 x 좌표 계산
-            name_x = (card_width_px - name_width) // 2 - 30
-            birth_x = (card_width_px - birth_width) // 2 - 30
-            
-            # 텍스트 y 좌표 계산
-            name_y = 260 + photo_height_px 
-            birth_y = name_y + self.FONT_SIZE + 15
-            
-            # 텍스트 그리기
-            draw.text((name_x, name_y), name, font=font, fill='black')
-            # draw.text((birth_x, birth_y), birthdate, font=font, fill='black')
+            # 1~2. 미리 그려둔 카드 바탕에 사진과 이름만 합성
+            card = self.render(name, birthdate, photo)
             
             # 3. 결과 이미지 저장
-            output_filename = f"card_{name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jpg"
-            output_path = os.path.join(Config.OUTPUT_DIR, output_filename)
-            card.save(output_path)
+            output_path = self.save_card(card, name, birthdate=birthdate, photo=photo)
             
             # 4. 프린터 출력
-            printer_name = win32print.GetDefaultPrinter()
-            hprinter = win32print.OpenPrinter(printer_name)
-            
-            hdc = win32ui.CreateDC()
-            hdc.CreatePrinterDC(printer_name)
-            
-            hdc.StartDoc('명예군민증')
-            hdc.StartPage()
-            
-            dib = ImageWin.Dib(card)
-            dib.draw(hdc.GetHandleOutput(), 
-                    (0, 0, self.width_dots, self.height_dots))
-            
-            hdc.EndPage()
-            hdc.EndDoc()
-            hdc.DeleteDC()
-            
-            win32print.ClosePrinter(hprinter)
+            self.print_output(card, name, birthdate, photo)
             
             return True, output_path
             
@@ -119,9 +98,19 @@ class CardPrinter:
             print(f"출력 오류: {str(e)}")
             return False, None
 
+_card_printer = None
+
+def get_card_printer():
+    """프로세스 공용 CardPrinter 반환 (폰트는 처음 한 번만 로드)"""
+    global _card_printer
+    if _card_printer is None:
+        _card_printer = CardPrinter()
+        FontRegistry.get_font(_card_printer.FONT_SIZE)
+    return _card_printer
+
 def print_honorary_citizen_card(name, birthdate, photo):
     """메인 출력 함수"""
-    printer = CardPrinter()
+    printer = get_card_printer()
     try:
         success, output_path = printer.print_card(name, birthdate, photo)
         
@@ -0,0 +1,173 @@
+import copy
+import json
+import logging
+import os
+import threading
+
+from PIL import Image, ImageDraw
+from config import Config
+from utils.fonts import FontRegistry, fit_text
+from utils.photo import resize
+
+# 기본 카드 디자인 (mm 단위, 좌상단 기준)
+# resources/card_template.json 파일이 있으면 같은 키를 덮어씀
+DEFAULT_TEMPLATE = {
+    'width': Config.CARD_WIDTH,
+    'height': Config.CARD_HEIGHT,
+    'background': None,  # 배경 이미지 파일명 (resources 폴더 기준, 카드 크기로 맞춤)
+    'photo': {'x': 9.83, 'y': 17.96, 'width': Config.PHOTO_WIDTH, 'height': Config.PHOTO_HEIGHT},
+    'texts': [
+        # field: 발급 시마다 바뀌는 값 (name, birthdate), text: 고정 문구
+        # 영역보다 긴 값은 min_font_size(pt)까지 줄이고, 그래도 넘치면 max_lines까지 줄을 나눔
+        {'field': 'name', 'x': 0, 'y': 61.98, 'width': 52.92, 'font_size': 16, 'align': 'center', 'fill': 'black',
+         'min_font_size': 10, 'max_lines': 2},
+    ],
+}
+
+
+def mm_to_px(mm, dpi):
+    """mm를 프린터 dot으로 변환"""
+    return int(mm * dpi / 25.4)
+
+
+def _merge(base, override):
+    """override의 값을 base에 덮어씀 - dict는 키별로 합치고 목록(texts 등)은 통째로 교체"""
+    for key, value in override.items():
+        if isinstance(value, dict) and isinstance(base.get(key), dict):
+            _merge(base[key], value)
+        else:
+            base[key] = value
+    return base
+
+
+def load_template(path=None):
+    """카드 디자인 읽기 - 파일이 없으면 기본 디자인 사용 (파일에 없는 키는 기본값 유지)"""
+    path = path or Config.CARD_TEMPLATE_PATH
+    template = copy.deepcopy(DEFAULT_TEMPLATE)
+
+    if path and os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            _merge(template, json.load(f))
+        logging.info(f"Card template loaded from: {path}")
+
+    return template
+
+
+def text_slot(template, text, dpi):
+    """디자인의 텍스트 항목(mm, pt)을 해당 DPI의 dot 단위 영역으로 변환"""
+    return {
+        'field': text.get('field'),
+        'x': mm_to_px(text.get('x', 0), dpi),
+        'y': mm_to_px(text['y'], dpi),
+        'width': mm_to_px(text.get('width', template['width'] - text.get('x', 0)), dpi),
+        'font_size': int(text.get('font_size', 16) * dpi / 72),
+        'min_font_size': int(text.get('min_font_size', text.get('font_size', 16)) * dpi / 72),
+        'max_lines': text.get('max_lines', 1),
+        'line_spacing': text.get('line_spacing', 1.2),
+        'align': text.get('align', 'center'),
+        'fill': text.get('fill', 'black'),
+    }
+
+
+def layout_text(slot, value):
+    """영역 너비에 맞춰 글자 크기/줄 나눔을 정하고 줄별 위치 계산 - ([(줄, x, y)], 글자 크기)"""
+    if not value:
+        return [], slot['font_size']
+
+    lines, size = fit_text(value, slot['width'], slot['font_size'], slot['min_font_size'], slot['max_lines'])
+    line_height = int(size * slot['line_spacing'])
+
+    y = slot['y']
+    if len(lines) == 1:
+        # 줄어든 한 줄은 원래 줄 높이 안에서 세로 가운데 정렬
+        y += (slot['font_size'] - size) // 2
+
+    placements = []
+    for line in lines:
+        bbox = FontRegistry.text_bbox(line, size)
+        text_width = bbox[2] - bbox[0]
+
+        if slot['align'] == 'left':
+            x = slot['x']
+        elif slot['align'] == 'right':
+            x = slot['x'] + slot['width'] - text_width
+        else:
+            x = slot['x'] + (slot['width'] - text_width) // 2
+
+        placements.append((line, x, y))
+        y += line_height
+    return placements, size
+
+
+class CompiledTemplate:
+    """고정 요소를 미리 그려둔 카드 바탕과 발급 시마다 채울 영역 목록"""
+
+    def __init__(self, template, dpi):
+        self.dpi = dpi
+        self.template = template
+        self.size = (mm_to_px(template['width'], dpi), mm_to_px(template['height'], dpi))
+
+        photo = template['photo']
+        self.photo_box = (
+            mm_to_px(photo['x'], dpi), mm_to_px(photo['y'], dpi),
+            mm_to_px(photo['width'], dpi), mm_to_px(photo['height'], dpi)
+        )
+
+        self.text_slots = []
+        self.base = self._render_base(template)
+
+    def _render_base(self, template):
+        """배경과 고정 문구를 그린 카드 바탕 생성"""
+        base = Image.new('RGB', self.size, 'white')
+        base.info['dpi'] = (self.dpi, self.dpi)  # 출력 시 실제 크기 계산용 (복사본에도 유지됨)
+
+        if template.get('background'):
+            background_path = os.path.join(Config.RESOURCES_DIR, template['background'])
+            with Image.open(background_path) as background:
+                base.paste(resize(background.convert('RGB'), self.size), (0, 0))
+
+        draw = ImageDraw.Draw(base)
+        for text in template.get('texts', []):
+            slot = text_slot(template, text, self.dpi)
+            if slot['field']:
+                self.text_slots.append(slot)
+            else:
+                self._draw_text(draw, slot, text.get('text', ''))
+
+        return base
+
+    @staticmethod
+    def _draw_text(draw, slot, value):
+        """영역 너비에 맞춰 배치한 텍스트 그리기"""
+        placements, size = layout_text(slot, value)
+        font = FontRegistry.get_font(size)
+        for line, x, y in placements:
+            draw.text((x, y), line, font=font, fill=slot['fill'])
+
+    def render(self, values, photo):
+        """카드 바탕을 복사해 사진과 입력값만 합성"""
+        card = self.base.copy()
+
+        x, y, width, height = self.photo_box
+        if photo.size != (width, height):
+            photo = resize(photo, (width, height))
+        card.paste(photo, (x, y))
+
+        draw = ImageDraw.Draw(card)
+        for slot in self.text_slots:
+            self._draw_text(draw, slot, values.get(slot['field'], ''))
+
+        return card
+
+
+_compiled = {}
+_compiled_lock = threading.Lock()
+
+
+def get_compiled_template(dpi=None):
+    """DPI별로 한 번만 컴파일한 카드 디자인 반환"""
+    dpi = dpi or Config.PRINTER_DPI
+    with _compiled_lock:
+        if dpi not in _compiled:
+            _compiled[dpi] = CompiledTemplate(load_template(), dpi)
+        return _compiled[dpi]
@@ -1,69 +1,338 @@
 import pandas as pd
 from datetime import datetime
 from config import Config
+from utils.files import write_atomic
+from utils.registry import COLUMNS, get_registry, normalize_key, read_visitor_excel
+from utils.shared_registry import get_shared_registry
+import json
+import logging
 import os
+import threading
 
 class ExcelManager:
+    # 중복 체크용 인덱스 (정규화된 (이름, 생년월일) 집합)
+    _index = None
+    _index_stat = None
+
+    # 잠금 순서: _compact_lock -> _journal_lock -> _index_lock
+    _index_lock = threading.Lock()
+    _journal_lock = threading.Lock()
+    _compact_lock = threading.Lock()
+
+    # 유휴 시간 병합 타이머
+    _journal_count = 0
+    _compact_timer = None
+
+    @staticmethod
+    def normalize_key(name, birthdate):
+        """중복 체크용 키 정규화"""
+        return normalize_key(name, birthdate)
+
+    @staticmethod
+    def use_registry():
+        """엑셀 파일 대신 별도 저장소(SQLite, 월별 분할) 사용 여부"""
+        return Config.REGISTRY_BACKEND in ('sqlite', 'sharded')
+
+    @classmethod
+    def initialize(cls):
+        """시작 시 저장소 준비 (미병합 저널 반영 및 인덱스 생성)"""
+        Config.initialize_directories()
+
+        # 이전 실행에서 병합되지 않은 저널을 엑셀 파일에 반영
+        cls.compact()
+
+        # 공유 저장소를 사용하는 경우 다른 키오스크의 이력을 미리 읽어둠
+        try:
+            get_shared_registry()
+        except Exception as e:
+            logging.warning(f"공유 저장소 초기화 실패: {e}")
+
+        if cls.use_registry():
+            registry = get_registry()
+            # DB를 처음 만든 경우 기존 엑셀 파일을 한 번만 가져오기
+            if registry.created and os.path.exists(Config.EXCEL_PATH):
+                imported, skipped = registry.import_excel(Config.EXCEL_PATH)
+                logging.info(f"Registry migrated from Excel: {imported} imported, {skipped} skipped")
+                registry.created = False
+            return registry.count()
+
+        return len(cls.build_index())
+
+    @staticmethod
+    def _file_stat():
+        """엑셀 파일의 (수정시각, 크기) 반환 - 파일이 없으면 None"""
+        try:
+            stat = os.stat(Config.EXCEL_PATH)
+            return (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            return None
+
+    @staticmethod
+    def _compacting_path():
+        """병합 중인 저널 파일 경로"""
+        return Config.JOURNAL_PATH + '.compacting'
+
+    @staticmethod
+    def _read_journal(path):
+        """저널 파일의 레코드 목록 반환 (전원 차단으로 잘린 마지막 줄은 무시)"""
+        records = []
+        if not os.path.exists(path):
+            return records
+
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if isinstance(record, dict):
+                    records.append(record)
+        return records
+
     @staticmethod
-    def check_duplicate(name, birthdate):
-        """중복 체크 함수"""
+    def _read_excel():
+        """엑셀 파일을 문자열 컬럼으로 읽기"""
+        return pd.read_excel(Config.EXCEL_PATH, dtype={'이름': str, '생년월일': str})
+
+    @classmethod
+    def build_index(cls):
+        """엑셀 파일과 미병합 저널을 읽어 중복 체크 인덱스 생성"""
+        with cls._compact_lock, cls._journal_lock, cls._index_lock:
+            stat = cls._file_stat()
+            index = set()
+
+            if stat is not None:
+                df = cls._read_excel()
+                names = df['이름'].fillna('').str.strip()
+                birthdates = df['생년월일'].fillna('').str.strip()
+                index = set(zip(names, birthdates))
+
+            for path in (cls._compacting_path(), Config.JOURNAL_PATH):
+                for record in cls._read_journal(path):
+                    index.add(cls.normalize_key(record.get('이름', ''), record.get('생년월일', '')))
+
+            cls._index = index
+            cls._index_stat = stat
+            return index
+
+    @classmethod
+    def iter_visitors(cls):
+        """저장 방식과 관계없이 모든 방문자 행 (이름, 생년월일, 등록일시) 반환"""
+        if cls.use_registry():
+            for chunk in get_registry().iter_rows():
+                yield from chunk
+            return
+
+        if os.path.exists(Config.EXCEL_PATH):
+            yield from read_visitor_excel(Config.EXCEL_PATH)
+        for path in (cls._compacting_path(), Config.JOURNAL_PATH):
+            for record in cls._read_journal(path):
+                yield record.get('이름', ''), record.get('생년월일', ''), record.get('등록일시', '')
+
+    @classmethod
+    def _get_index(cls):
+        """인덱스 반환 - 외부에서 파일이 수정된 경우 재생성"""
+        if cls._index is None or cls._file_stat() != cls._index_stat:
+            return cls.build_index()
+        return cls._index
+
+    @classmethod
+    def check_duplicate(cls, name, birthdate):
+        """중복 체크 함수 - 로컬 저장소를 읽을 수 없으면 예외 발생"""
+        # 디렉토리 초기화
+        Config.initialize_directories()
+
+        # 다른 키오스크의 발급 이력 확인
+        try:
+            shared = get_shared_registry()
+            if shared is not None and shared.contains(name, birthdate):
+                return True
+        except Exception as e:
+            # 공유 폴더에 접근할 수 없어도 이 키오스크의 발급 이력으로 확인
+            logging.warning(f"공유 저장소 확인 실패, 로컬 이력만 확인합니다: {e}")
+
+        try:
+            if cls.use_registry():
+                return get_registry().contains(name, birthdate)
+
+            return cls.normalize_key(name, birthdate) in cls._get_index()
+
+        except Exception as e:
+            logging.error(f"중복 체크 중 오류 발생: {e}")
+            raise
+
+    @classmethod
+    def save_visitor_info(cls, name, birthdate):
+        """방문자 정보 저장 (저널에 추가 후 유휴 시간에 엑셀로 병합)"""
         try:
             # 디렉토리 초기화
             Config.initialize_directories()
-            
-            if os.path.exists(Config.EXCEL_PATH):
-                # 엑셀 파일 읽기 (인코딩 명시)
-                df = pd.read_excel(Config.EXCEL_PATH, dtype={'이름': str, '생년월일': str})
-                
-                # 입력값 정규화
-                name = name.strip()
-                birthdate = birthdate.strip()
-                
-                # DataFrame의 값들도 정규화
-                df['이름'] = df['이름'].str.strip()
-                df['생년월일'] = df['생년월일'].str.strip()
-                
-                # 각 행 검사
-                for index, row in df.iterrows():
-                    if row['이름'] == name and row['생년월일'] == birthdate:
-                        return True
+
+            record = {
+                '이름': name,
+                '생년월일': birthdate,
+                '등록일시': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            }
+
+            # 다른 키오스크에서 먼저 등록된 경우 저장하지 않음
+            if not cls._claim_shared([(name, birthdate, record['등록일시'])]):
                 return False
-                
-            return False
-            
+
+            if cls.use_registry():
+                return get_registry().add(name, birthdate, record['등록일시'])
+
+            # 저널에 한 줄 추가 후 디스크에 기록될 때까지 대기
+            with cls._journal_lock:
+                with open(Config.JOURNAL_PATH, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps(record, ensure_ascii=False) + '\n')
+                    f.flush()
+                    os.fsync(f.fileno())
+                cls._journal_count += 1
+                journal_count = cls._journal_count
+
+                # 인덱스 갱신 (저널에 기록한 항목은 재생성 없이 반영)
+                with cls._index_lock:
+                    if cls._index is not None:
+                        cls._index.add(cls.normalize_key(name, birthdate))
+
+            cls.schedule_compaction(immediate=journal_count >= Config.JOURNAL_COMPACT_THRESHOLD)
+            return True
+
         except Exception as e:
+            logging.error(f"방문자 정보 저장 중 오류 발생: {e}")
             return False
-    
+
+    @classmethod
+    def ensure_registered(cls, name, birthdate):
+        """등록되지 않은 방문자만 등록 (복구된 출력 작업용) - 등록되어 있으면 True"""
+        if cls.check_duplicate(name, birthdate):
+            return True
+        return cls.save_visitor_info(name, birthdate)
+
     @staticmethod
-    def save_visitor_info(name, birthdate):
-        """방문자 정보 저장"""
+    def _claim_shared(records):
+        """공유 저장소에 먼저 기록 - 저장해도 되는 레코드 목록 반환"""
         try:
-            # 디렉토리 초기화
-            Config.initialize_directories()
-            
-            # 파일 경로 로깅
-            # print(f"Excel 저장 경로: {Config.EXCEL_PATH}")
-            
-            new_data = pd.DataFrame({
-                '이름': [name],
-                '생년월일': [birthdate],
-                '등록일시': [datetime.now().strftime('%Y-%m-%d %H:%M:%S')]
-            })
-            
-            if os.path.exists(Config.EXCEL_PATH):
-                # print("기존 Excel 파일 읽기 시도...")
-                df = pd.read_excel(Config.EXCEL_PATH)
-                df = pd.concat([df, new_data], ignore_index=True)
+            shared = get_shared_registry()
+            if shared is None:
+                return records
+
+            return shared.add_many(records)
+        except Exception as e:
+            # 공유 폴더에 접근할 수 없어도 이 키오스크의 발급은 계속 진행
+            logging.warning(f"공유 저장소 기록 실패, 로컬에만 저장합니다: {e}")
+            return records
+
+    @classmethod
+    def existing_keys(cls):
+        """등록된 정규화 키 집합 반환"""
+        if cls.use_registry():
+            keys = get_registry().keys()
+        else:
+            keys = set(cls._get_index())
+
+        shared = get_shared_registry()
+        if shared is not None:
+            keys |= shared.keys()
+        return keys
+
+    @classmethod
+    def save_visitors(cls, visitors):
+        """여러 방문자를 한 번에 저장 - [(이름, 생년월일), ...]"""
+        Config.initialize_directories()
+        registered_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        records = [(name, birthdate, registered_at) for name, birthdate in visitors]
+        records = cls._claim_shared(records)
+        if not records:
+            return 0
+
+        if cls.use_registry():
+            return get_registry().add_many(records)
+
+        # 저널에 한 번에 기록 후 즉시 병합
+        with cls._journal_lock:
+            with open(Config.JOURNAL_PATH, 'a', encoding='utf-8') as f:
+                f.write(''.join(
+                    json.dumps(dict(zip(COLUMNS, record)), ensure_ascii=False) + '\n'
+                    for record in records
+                ))
+                f.flush()
+                os.fsync(f.fileno())
+            cls._journal_count += len(records)
+
+            with cls._index_lock:
+                if cls._index is not None:
+                    cls._index.update(cls.normalize_key(name, birthdate) for name, birthdate, _ in records)
+
+        cls.schedule_compaction(immediate=True)
+        return len(records)
+
+    @classmethod
+    def schedule_compaction(cls, immediate=False):
+        """저널 병합 예약 - 유휴 시간이 지나거나 임계값을 넘으면 백그라운드에서 실행"""
+        delay = 0 if immediate else Config.JOURNAL_COMPACT_IDLE_SECONDS
+
+        with cls._journal_lock:
+            if cls._compact_timer is not None:
+                cls._compact_timer.cancel()
+
+            cls._compact_timer = threading.Timer(delay, cls.compact)
+            cls._compact_timer.daemon = True
+            cls._compact_timer.start()
+
+    @classmethod
+    def compact(cls):
+        """저널을 엑셀 파일에 병합 (시작 시 미완료 병합도 재실행)"""
+        try:
+            with cls._compact_lock:
+                # 이전에 중단된 병합부터 처리
+                if os.path.exists(cls._compacting_path()):
+                    cls._fold_journal(cls._compacting_path())
+
+                with cls._journal_lock:
+                    if not os.path.exists(Config.JOURNAL_PATH) or os.path.getsize(Config.JOURNAL_PATH) == 0:
+                        return True
+                    os.replace(Config.JOURNAL_PATH, cls._compacting_path())
+                    cls._journal_count = 0
+
+                cls._fold_journal(cls._compacting_path())
+                return True
+
+        except Exception as e:
+            logging.error(f"저널 병합 중 오류 발생: {e}", exc_info=True)
+            return False
+
+    @classmethod
+    def _fold_journal(cls, journal_path):
+        """저널 파일 하나를 엑셀 파일에 병합한 뒤 삭제"""
+        records = cls._read_journal(journal_path)
+        stat_before = cls._file_stat()
+
+        if records:
+            new_data = pd.DataFrame(records, columns=COLUMNS).astype(str)
+
+            if stat_before is not None:
+                df = cls._read_excel()
+
+                # 이미 병합된 항목 제외 (파일 교체 후 저널 삭제 전에 중단된 경우)
+                existing = set(zip(
+                    df['이름'].fillna('').str.strip(),
+                    df['생년월일'].fillna('').str.strip(),
+                    df['등록일시'].astype(str)
+                ))
+                mask = [
+                    (n.strip(), b.strip(), t) not in existing
+                    for n, b, t in zip(new_data['이름'], new_data['생년월일'], new_data['등록일시'])
+                ]
+                df = pd.concat([df, new_data[mask]], ignore_index=True)
             else:
-                # print("새로운 Excel 파일 생성...")
                 df = new_data
-            
-            # 엑셀 파일 저장
-            # print("Excel 파일 저장 시도...")
-            df.to_excel(Config.EXCEL_PATH, index=False, engine='openpyxl')
-            # print("Excel 파일 저장 성공!")
-            return True
-            
-        except Exception as e:
-            # print(f"Excel 저장 중 오류 발생: {str(e)}")
-            return False
\ No newline at end of file
+
+            write_atomic(Config.EXCEL_PATH, lambda f: df.to_excel(f, index=False, engine='openpyxl'))
+
+            # 직접 병합한 변경은 인덱스 재생성 없이 반영
+            with cls._index_lock:
+                if cls._index is not None and cls._index_stat == stat_before:
+                    cls._index_stat = cls._file_stat()
+
+        os.remove(journal_path)
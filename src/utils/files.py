@@ -0,0 +1,20 @@
+import os
+
+
+def write_atomic(path, write):
+    """path 옆 임시 파일에 write(파일 객체)로 기록하고 디스크에 반영한 뒤 원자적으로 교체
+
+    중간에 종료되어도 이전 파일이나 새 파일 중 하나만 남고, 실패하면 임시 파일을 지운 뒤 예외를 그대로 전달한다.
+    파일은 읽기/쓰기 바이너리 모드로 열리므로 텍스트는 encode해서 쓴다.
+    """
+    tmp_path = path + '.tmp'
+    try:
+        with open(tmp_path, 'w+b') as f:
+            write(f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
@@ -0,0 +1,162 @@
+from PIL import Image, ImageDraw, ImageFont
+import os
+import threading
+from functools import lru_cache
+from config import Config
+
+# 폰트 후보 경로 (앞에서부터 사용 가능한 첫 폰트 사용)
+FONT_PATHS = [
+    "C:/Windows/Fonts/malgun.ttf",      # 맑은 고딕 일반
+    "C:/Windows/Fonts/MALGUN.TTF",      # 대문자로 시도
+    "C:/Windows/Fonts/msgothic.ttc",    # MS Gothic
+    "C:/Windows/Fonts/gulim.ttc",       # 굴림
+    # Linux 대체 폰트
+    "/usr/share/fonts/truetype/nanum/NanumGothic.ttf",
+    "/usr/share/fonts/opentype/noto/NotoSansCJK-Regular.ttc",
+    "/usr/share/fonts/noto-cjk/NotoSansCJK-Regular.ttc",
+    "/usr/share/fonts/google-noto-cjk/NotoSansCJK-Regular.ttc",
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+]
+
+# 기본 이름 폰트 크기 (16pt를 프린터 DPI에 맞게 변환)
+DEFAULT_FONT_SIZE = int(16 * Config.PRINTER_DPI / 72)
+
+class FontRegistry:
+    """프로세스 공용 폰트 캐시 - 폰트 경로는 한 번만 찾고 (경로, 크기)별로 재사용"""
+    _font_path = None
+    _resolved = False
+    _fonts = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def resolve_font_path(cls):
+        """사용 가능한 첫 폰트 경로 반환 - 없으면 None (기본 폰트 사용)"""
+        with cls._lock:
+            if not cls._resolved:
+                for font_path in FONT_PATHS:
+                    try:
+                        if os.path.exists(font_path):
+                            cls._fonts[(font_path, DEFAULT_FONT_SIZE)] = ImageFont.truetype(font_path, DEFAULT_FONT_SIZE)
+                            cls._font_path = font_path
+                            print(f"폰트 로드 성공: {font_path}")
+                            break
+                    except Exception as e:
+                        print(f"폰트 로드 실패 ({font_path}): {str(e)}")
+                        continue
+
+                if cls._font_path is None:
+                    print("모든 폰트 로드 실패, 기본 폰트 사용")
+                cls._resolved = True
+            return cls._font_path
+
+    @classmethod
+    def get_font(cls, size):
+        """지정한 크기의 폰트 반환"""
+        font_path = cls.resolve_font_path()
+        key = (font_path, size)
+        with cls._lock:
+            font = cls._fonts.get(key)
+            if font is None:
+                font = ImageFont.truetype(font_path, size) if font_path else ImageFont.load_default()
+                cls._fonts[key] = font
+            return font
+
+    @classmethod
+    def text_bbox(cls, text, size):
+        """텍스트 영역 (left, top, right, bottom) 반환 - 결과 캐시"""
+        return _text_bbox(text, cls.resolve_font_path(), size)
+
+
+@lru_cache(maxsize=1024)
+def _text_bbox(text, font_path, size):
+    draw = ImageDraw.Draw(Image.new('RGB', (1, 1)))
+    return draw.textbbox((0, 0), text, font=FontRegistry.get_font(size))
+
+
+def _text_width(text, font_path, size):
+    left, _, right, _ = _text_bbox(text, font_path, size)
+    return right - left
+
+
+@lru_cache(maxsize=1024)
+def _fit_size(text, font_path, max_width, max_size, min_size):
+    """max_width 안에 들어가는 가장 큰 글자 크기 (이분 탐색, 없으면 min_size)"""
+    if _text_width(text, font_path, max_size) <= max_width:
+        return max_size
+
+    low, high = min_size, max_size - 1
+    best = min_size
+    while low <= high:
+        middle = (low + high) // 2
+        if _text_width(text, font_path, middle) <= max_width:
+            best = middle
+            low = middle + 1
+        else:
+            high = middle - 1
+    return best
+
+
+def _split_lines(text, font_path, size, count):
+    """count줄 중 가장 긴 줄이 가장 짧아지도록 나누기 (공백이 있으면 공백에서, 없으면 글자 사이에서)
+
+    나눌 수 있는 단위가 count개보다 적으면 None
+    """
+    words = text.split()
+    units, separator = (words, ' ') if len(words) > 1 else (list(text.strip()), '')
+    if len(units) < count:
+        return None
+
+    def width(start, stop):
+        return _text_width(separator.join(units[start:stop]), font_path, size)
+
+    # best[k][i]: 앞의 i개 단위를 k줄로 나눴을 때 (가장 긴 줄 너비, 마지막 줄 시작 위치)
+    best = [{0: (0, 0)}]
+    for lines in range(1, count + 1):
+        row = {}
+        for stop in range(lines, len(units) - (count - lines) + 1):
+            row[stop] = min(
+                (max(best[-1][start][0], width(start, stop)), start)
+                for start in range(lines - 1, stop) if start in best[-1]
+            )
+        best.append(row)
+
+    result = []
+    stop = len(units)
+    for lines in range(count, 0, -1):
+        start = best[lines][stop][1]
+        result.append(separator.join(units[start:stop]))
+        stop = start
+    return tuple(reversed(result))
+
+
+@lru_cache(maxsize=1024)
+def _fit_text(text, font_path, max_width, max_size, min_size, max_lines):
+    """한 줄부터 max_lines줄까지 차례로 맞춰 봄
+
+    최소 크기까지 줄이지 않고 들어가는 가장 적은 줄 수를 쓰고, 없으면 들어가는 것 중 글자가 가장 큰 것,
+    어느 것도 들어가지 않으면 가장 많이 나눈 것을 쓴다.
+    """
+    candidates = []
+    for count in range(1, max(max_lines, 1) + 1):
+        lines = (text,) if count == 1 else _split_lines(text, font_path, max_size, count)
+        if lines is None:
+            break
+        size = min(_fit_size(line, font_path, max_width, max_size, min_size) for line in lines)
+        fits = all(_text_width(line, font_path, size) <= max_width for line in lines)
+        if fits and (size > min_size or size == max_size):
+            return lines, size
+        candidates.append((lines, size, fits))
+
+    fitting = [candidate for candidate in candidates if candidate[2]]
+    if fitting:
+        # 같은 크기면 줄 수가 적은 쪽 (max는 처음 나온 최댓값을 반환)
+        lines, size, _ = max(fitting, key=lambda candidate: candidate[1])
+    else:
+        lines, size, _ = candidates[-1]
+    return lines, size
+
+
+def fit_text(text, max_width, max_size, min_size=None, max_lines=1):
+    """영역 너비에 맞춘 (줄 목록, 글자 크기) 반환 - (텍스트, 폰트, 크기)별 측정값 캐시"""
+    min_size = min(min_size or max_size, max_size)
+    return _fit_text(text, FontRegistry.resolve_font_path(), max_width, max_size, min_size, max_lines)
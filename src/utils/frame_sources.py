@@ -0,0 +1,287 @@
+import glob
+import json
+import logging
+import os
+import time
+
+import cv2
+import numpy as np
+from config import Config
+from utils.files import write_atomic
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp')
+WARMUP_FRAMES = 5
+
+
+def synthetic_frame(width=Config.CAMERA_WIDTH, height=Config.CAMERA_HEIGHT, seed=0):
+    """카메라 대신 사용할 BGR 프레임 (그라데이션 + 잡음, 매번 같은 값)"""
+    rng = np.random.default_rng(seed)
+    x = np.linspace(0, 255, width, dtype=np.float32)
+    y = np.linspace(0, 255, height, dtype=np.float32)[:, None]
+    frame = np.empty((height, width, 3), dtype=np.uint8)
+    frame[..., 0] = x
+    frame[..., 1] = y
+    frame[..., 2] = (x + y) / 2
+    noise = rng.integers(0, 16, size=frame.shape, dtype=np.uint8)
+    return frame + noise
+
+
+def _fourcc_text(value):
+    value = int(value)
+    return ''.join(chr((value >> (8 * i)) & 0xFF) for i in range(4))
+
+
+def load_camera_cache(path=None):
+    """장치별 카메라 설정 캐시 - {장치 번호: 설정}"""
+    path = path or Config.CAMERA_CACHE_PATH
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_camera_cache(cache, path=None):
+    path = path or Config.CAMERA_CACHE_PATH
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    write_atomic(path, lambda f: f.write(json.dumps(cache, ensure_ascii=False, indent=2).encode('utf-8')))
+
+
+class CameraSource:
+    """웹캠 (cv2.VideoCapture)
+
+    처음 열 때 사용 가능한 API를 찾고 해상도/fps를 설정한 뒤, 실제로 협상된 값(API, 해상도, fps, FOURCC)을
+    장치별로 캐시한다. 다음 실행부터는 캐시한 값을 열기 인자로 한 번에 전달하여 API 탐색과 설정 재협상을
+    건너뛰고, 캐시한 값으로 열리지 않거나 다른 해상도로 열리면 처음처럼 다시 탐색한다.
+    """
+
+    name = 'camera'
+
+    def __init__(self, index=None, cache_path=None):
+        self.index = Config.CAMERA_INDEX if index is None else index
+        self.cache_path = cache_path or Config.CAMERA_CACHE_PATH
+        self.capture = None
+        self.fps = Config.CAMERA_FPS
+
+    def _requested(self):
+        return [Config.CAMERA_WIDTH, Config.CAMERA_HEIGHT, Config.CAMERA_FPS]
+
+    def _open_cached(self, settings):
+        """캐시한 설정으로 열기 - 실패하거나 다른 해상도로 열리면 None"""
+        params = [
+            cv2.CAP_PROP_FRAME_WIDTH, settings['width'],
+            cv2.CAP_PROP_FRAME_HEIGHT, settings['height'],
+            cv2.CAP_PROP_FPS, int(round(settings['fps'])),
+            cv2.CAP_PROP_BUFFERSIZE, 1,
+        ]
+        # FOURCC를 알려주지 않는 장치도 있음
+        if settings['fourcc'].strip('\x00'):
+            params[:0] = [cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*settings['fourcc'])]
+        try:
+            capture = cv2.VideoCapture(self.index, settings['api'], params)
+        except cv2.error:
+            return None
+
+        if capture.isOpened() and (int(capture.get(cv2.CAP_PROP_FRAME_WIDTH)),
+                                   int(capture.get(cv2.CAP_PROP_FRAME_HEIGHT))) == (settings['width'], settings['height']):
+            return capture
+        capture.release()
+        return None
+
+    def _probe(self):
+        """사용 가능한 API를 찾아 열고 요청 해상도/fps 설정 - (capture, API) 또는 (None, None)"""
+        api = cv2.CAP_DSHOW
+        capture = cv2.VideoCapture(self.index, api)
+        if not capture.isOpened():
+            api = cv2.CAP_ANY
+            capture = cv2.VideoCapture(self.index)
+
+        if not capture.isOpened():
+            return None, None
+
+        # 카메라 설정 최적화
+        capture.set(cv2.CAP_PROP_FRAME_WIDTH, Config.CAMERA_WIDTH)
+        capture.set(cv2.CAP_PROP_FRAME_HEIGHT, Config.CAMERA_HEIGHT)
+        capture.set(cv2.CAP_PROP_BUFFERSIZE, 1)  # 버퍼 크기 최소화
+        capture.set(cv2.CAP_PROP_FPS, Config.CAMERA_FPS)
+        return capture, api
+
+    def open(self):
+        """카메라 열기 및 설정 - 성공 여부 반환"""
+        key = str(self.index)
+        cache = load_camera_cache(self.cache_path)
+        settings = cache.get(key)
+        capture = None
+        if settings and settings.get('requested') == self._requested():
+            capture = self._open_cached(settings)
+            if capture is None:
+                logging.info("Cached camera settings rejected, probing again")
+
+        if capture is None:
+            capture, api = self._probe()
+            if capture is None:
+                logging.error("카메라를 찾을 수 없습니다")
+                return False
+
+            settings = {
+                'requested': self._requested(),
+                'api': api,
+                'backend': capture.getBackendName(),
+                'width': int(capture.get(cv2.CAP_PROP_FRAME_WIDTH)),
+                'height': int(capture.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+                'fps': capture.get(cv2.CAP_PROP_FPS) or Config.CAMERA_FPS,
+                'fourcc': _fourcc_text(capture.get(cv2.CAP_PROP_FOURCC)),
+            }
+            cache[key] = settings
+            try:
+                save_camera_cache(cache, self.cache_path)
+            except OSError as e:
+                logging.warning(f"Failed to save camera cache: {e}")
+
+        logging.info(f"Camera {key}: {settings['backend']} {settings['width']}x{settings['height']} "
+                     f"{settings['fps']}fps {settings['fourcc']}")
+        self.fps = settings['fps']
+
+        # 초기 프레임 읽기로 카메라 워밍업
+        for _ in range(WARMUP_FRAMES):  # 처음 몇 프레임을 버림
+            capture.read()
+
+        self.capture = capture
+        return True
+
+    def isOpened(self):
+        return self.capture is not None and self.capture.isOpened()
+
+    def read(self):
+        return self.capture.read()
+
+    def release(self):
+        if self.capture is not None:
+            self.capture.release()
+            self.capture = None
+
+
+class PacedSource:
+    """카메라처럼 fps에 맞춰 프레임을 내주는 입력의 공통 부분"""
+
+    def __init__(self, fps):
+        self.fps = fps
+        self.opened = False
+        self._next_time = 0.0
+
+    def _wait_next_frame(self):
+        # 처리가 한 프레임 이상 밀리면 따라잡지 않고 지금부터 다시 맞춤
+        now = time.monotonic()
+        if self._next_time - now < -1.0 / self.fps:
+            self._next_time = now
+        elif self._next_time > now:
+            time.sleep(self._next_time - now)
+        self._next_time += 1.0 / self.fps
+
+    def isOpened(self):
+        return self.opened
+
+    def release(self):
+        self.opened = False
+
+
+class VideoFileSource(PacedSource):
+    """동영상 파일 또는 이미지 폴더를 반복 재생"""
+
+    name = 'video'
+
+    def __init__(self, path=None, fps=None):
+        super().__init__(fps or Config.CAMERA_FPS)
+        self.path = path or Config.FRAME_SOURCE_PATH
+        self.capture = None
+        self.images = []
+        self.position = 0
+
+    def open(self):
+        if not self.path or not os.path.exists(self.path):
+            logging.error(f"프레임 입력 파일을 찾을 수 없습니다: {self.path}")
+            return False
+
+        if os.path.isdir(self.path):
+            self.images = sorted(
+                path for path in glob.glob(os.path.join(self.path, '*'))
+                if path.lower().endswith(IMAGE_EXTENSIONS)
+            )
+            if not self.images:
+                logging.error(f"이미지가 없습니다: {self.path}")
+                return False
+        else:
+            self.capture = cv2.VideoCapture(self.path)
+            if not self.capture.isOpened():
+                logging.error(f"동영상을 열 수 없습니다: {self.path}")
+                return False
+            # fps를 따로 지정하지 않으면 파일의 fps로 재생
+            self.fps = self.capture.get(cv2.CAP_PROP_FPS) or self.fps
+
+        self.opened = True
+        return True
+
+    def read(self):
+        self._wait_next_frame()
+        if self.images:
+            frame = cv2.imread(self.images[self.position % len(self.images)])
+            self.position += 1
+            return frame is not None, frame
+
+        ok, frame = self.capture.read()
+        if not ok:
+            # 끝까지 재생하면 처음부터 다시
+            self.capture.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ok, frame = self.capture.read()
+        return ok, frame
+
+    def release(self):
+        super().release()
+        if self.capture is not None:
+            self.capture.release()
+            self.capture = None
+
+
+class SyntheticSource(PacedSource):
+    """합성 프레임 (고정 배경 위로 원이 움직임) - 카메라 없이 시험/부하 측정용"""
+
+    name = 'synthetic'
+
+    def __init__(self, width=None, height=None, fps=None):
+        super().__init__(fps or Config.CAMERA_FPS)
+        self.width = width or Config.CAMERA_WIDTH
+        self.height = height or Config.CAMERA_HEIGHT
+        self.background = None
+        self.position = 0
+
+    def open(self):
+        self.background = synthetic_frame(self.width, self.height)
+        self.opened = True
+        return True
+
+    def read(self):
+        self._wait_next_frame()
+        # 카메라처럼 매번 새 배열을 반환
+        frame = self.background.copy()
+        radius = max(1, self.height // 6)
+        travel = max(1, self.width - 2 * radius)
+        x = radius + (self.position * 8) % travel
+        cv2.circle(frame, (x, self.height // 2), radius, (40, 180, 230), -1)
+        self.position += 1
+        return True, frame
+
+
+FRAME_SOURCES = {
+    CameraSource.name: CameraSource,
+    VideoFileSource.name: VideoFileSource,
+    SyntheticSource.name: SyntheticSource,
+}
+
+
+def get_frame_source(name=None):
+    """설정에 맞는 프레임 입력 생성 (Config.FRAME_SOURCE)"""
+    name = name or Config.FRAME_SOURCE
+    if name not in FRAME_SOURCES:
+        raise ValueError(f"알 수 없는 프레임 입력: {name}")
+    logging.info(f"Frame source: {name}")
+    return FRAME_SOURCES[name]()
@@ -0,0 +1,171 @@
+import argparse
+import itertools
+import logging
+import os
+
+from PIL import Image, ImageDraw
+from config import Config
+from utils.card_template import mm_to_px
+from utils.files import write_atomic
+
+# 용지 크기 (mm)
+PAPER_SIZES = {
+    'A4': (210, 297),
+    'Letter': (215.9, 279.4),
+}
+
+
+class SheetLayout:
+    """용지 한 장에 카드를 N장 배치하는 위치 계산"""
+
+    def __init__(self, paper=None, dpi=None, card_size=None, margin=None, gap=None, crop_mark=None):
+        paper = paper or Config.SHEET_PAPER
+        if paper not in PAPER_SIZES:
+            raise ValueError(f"알 수 없는 용지: {paper}")
+
+        self.paper = paper
+        self.dpi = dpi or Config.PRINTER_DPI
+        card_width, card_height = card_size or (Config.CARD_WIDTH, Config.CARD_HEIGHT)
+        paper_width, paper_height = PAPER_SIZES[paper]
+        margin = Config.SHEET_MARGIN if margin is None else margin
+        gap = Config.SHEET_GAP if gap is None else gap
+        crop_mark = Config.SHEET_CROP_MARK if crop_mark is None else crop_mark
+
+        # 카드 사이 간격에 재단선이 들어가므로 간격은 재단선 길이 이상 확보
+        gap = max(gap, crop_mark)
+        self.columns = int((paper_width - 2 * margin + gap) // (card_width + gap))
+        self.rows = int((paper_height - 2 * margin + gap) // (card_height + gap))
+        if self.columns < 1 or self.rows < 1:
+            raise ValueError(f"{paper} 용지에 카드를 배치할 수 없습니다")
+
+        self.size = (mm_to_px(paper_width, self.dpi), mm_to_px(paper_height, self.dpi))
+        self.card_size = (mm_to_px(card_width, self.dpi), mm_to_px(card_height, self.dpi))
+        self.crop_mark = mm_to_px(crop_mark, self.dpi)
+
+        # 배치 영역을 용지 가운데에 놓음
+        gap_px = mm_to_px(gap, self.dpi)
+        used_width = self.columns * self.card_size[0] + (self.columns - 1) * gap_px
+        used_height = self.rows * self.card_size[1] + (self.rows - 1) * gap_px
+        left = (self.size[0] - used_width) // 2
+        top = (self.size[1] - used_height) // 2
+
+        self.positions = [
+            (left + column * (self.card_size[0] + gap_px), top + row * (self.card_size[1] + gap_px))
+            for row in range(self.rows)
+            for column in range(self.columns)
+        ]
+
+    @property
+    def per_sheet(self):
+        return len(self.positions)
+
+    def draw_crop_marks(self, draw, position):
+        """카드 네 모서리 바깥쪽에 재단선 그리기"""
+        if not self.crop_mark:
+            return
+
+        x, y = position
+        width, height = self.card_size
+        length = self.crop_mark
+        for corner_x, direction_x in ((x, -1), (x + width - 1, 1)):
+            for corner_y, direction_y in ((y, -1), (y + height - 1, 1)):
+                # 가로선은 카드 좌우 바깥, 세로선은 카드 위아래 바깥
+                draw.line([(corner_x + direction_x, corner_y), (corner_x + direction_x * length, corner_y)], fill='black')
+                draw.line([(corner_x, corner_y + direction_y), (corner_x, corner_y + direction_y * length)], fill='black')
+
+
+def _paste_card(sheet, card, position, card_size):
+    """카드 한 장을 용지에 붙이기 (파일 경로면 붙인 뒤 바로 닫음)"""
+    if isinstance(card, (str, os.PathLike)):
+        with Image.open(card) as image:
+            _paste_card(sheet, image, position, card_size)
+        return
+
+    if card.size != card_size:
+        card = card.resize(card_size, Image.Resampling.LANCZOS)
+    sheet.paste(card.convert('RGB'), position)
+
+
+def impose(cards, layout=None):
+    """카드 이미지(또는 파일 경로)를 받아 용지 이미지를 한 장씩 생성
+
+    카드는 용지에 붙이는 즉시 놓아주므로 메모리에는 용지 한 장만 유지된다.
+    """
+    layout = layout or SheetLayout()
+    sheet = None
+    draw = None
+    slot = 0
+
+    for card in cards:
+        if sheet is None:
+            sheet = Image.new('RGB', layout.size, 'white')
+            sheet.info['dpi'] = (layout.dpi, layout.dpi)
+            draw = ImageDraw.Draw(sheet)
+
+        position = layout.positions[slot]
+        _paste_card(sheet, card, position, layout.card_size)
+        layout.draw_crop_marks(draw, position)
+        slot += 1
+
+        if slot == layout.per_sheet:
+            yield sheet
+            sheet = None
+            slot = 0
+
+    if sheet is not None:
+        yield sheet
+
+
+def print_sheets(cards, backend, layout=None, title='명예군민증 일괄 출력'):
+    """용지 단위로 출력 방식에 바로 전달 - 출력한 용지 수 반환"""
+    layout = layout or SheetLayout()
+    count = 0
+    for count, sheet in enumerate(impose(cards, layout), start=1):
+        backend.print_image(sheet, f'{title} ({count})')
+        logging.info(f"Sheet {count} sent to printer ({layout.per_sheet}-up {layout.paper})")
+    return count
+
+
+def save_pdf(cards, path, layout=None):
+    """용지를 여러 페이지 PDF로 저장 - 저장한 페이지 수 반환
+
+    페이지마다 파일에 이어 쓰므로 모든 페이지를 메모리에 모으지 않는다.
+    """
+    layout = layout or SheetLayout()
+    sheets = impose(cards, layout)
+    first = next(sheets, None)
+    if first is None:
+        return 0
+
+    count = 0
+
+    def write(f):
+        nonlocal count
+        for count, sheet in enumerate(itertools.chain([first], sheets), start=1):
+            sheet.save(f, format='PDF', resolution=layout.dpi, append=count > 1)
+
+    write_atomic(path, write)
+    return count
+
+
+def main():
+    """카드 이미지 일괄 출력 (src 폴더에서 python -m utils.imposition 으로 실행)"""
+    parser = argparse.ArgumentParser(description="카드 여러 장을 용지 한 장에 배치하여 출력")
+    parser.add_argument('cards', nargs='+', help="카드 이미지 파일")
+    parser.add_argument('--paper', choices=sorted(PAPER_SIZES), default=Config.SHEET_PAPER)
+    parser.add_argument('--pdf', help="프린터 대신 PDF 파일로 저장")
+    args = parser.parse_args()
+
+    layout = SheetLayout(args.paper)
+    if args.pdf:
+        pages = save_pdf(args.cards, args.pdf, layout)
+        print(f"{len(args.cards)}장을 {pages}쪽 PDF로 저장했습니다: {args.pdf}")
+    else:
+        from utils.card_printer import get_card_printer
+
+        pages = get_card_printer().print_batch(args.cards, layout=layout)
+        print(f"{len(args.cards)}장을 용지 {pages}장에 출력했습니다")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+from PIL import Image
+from config import Config
+
+# 결과 픽셀 수가 이 이상일 때만 타일로 나눠 병렬 리사이즈 (작은 이미지는 스레드 비용이 더 큼)
+# 600 DPI 카드 사진(826x944, 약 78만)과 300 DPI 배경(685x1062)은 병렬, 300 DPI 사진(413x472)은 그대로
+PARALLEL_RESIZE_MIN_PIXELS = 500_000
+RESIZE_WORKERS = min(8, os.cpu_count() or 1)
+
+_resize_pool = None
+
+
+def _get_resize_pool():
+    global _resize_pool
+    if _resize_pool is None:
+        _resize_pool = ThreadPoolExecutor(max_workers=RESIZE_WORKERS, thread_name_prefix='resize')
+    return _resize_pool
+
+
+def resize(image, size, resample=Image.Resampling.LANCZOS):
+    """PIL 리사이즈 - 큰 결과는 가로 띠 타일로 나눠 스레드 풀에서 병렬 처리
+
+    PIL은 리사이즈 중 GIL을 놓으므로 타일별로 원본 영역(box)을 지정해 동시에 계산하고 이어 붙인다.
+    각 타일도 필터 계산에 경계 밖 원본 픽셀을 사용하므로 한 번에 리사이즈한 결과와 거의 같다 (반올림 차이 1 이하).
+    """
+    width, height = size
+    if RESIZE_WORKERS < 2 or width * height < PARALLEL_RESIZE_MIN_PIXELS or height < RESIZE_WORKERS:
+        return image.resize(size, resample)
+
+    image.load()
+    scale = image.height / height
+    bounds = [height * i // RESIZE_WORKERS for i in range(RESIZE_WORKERS + 1)]
+
+    def resize_tile(top, bottom):
+        box = (0, top * scale, image.width, bottom * scale)
+        return top, image.resize((width, bottom - top), resample, box=box)
+
+    result = Image.new(image.mode, size)
+    tiles = _get_resize_pool().map(lambda i: resize_tile(bounds[i], bounds[i + 1]), range(RESIZE_WORKERS))
+    for top, tile in tiles:
+        result.paste(tile, (0, top))
+    return result
+
+
+def print_photo_size(dpi=None):
+    """카드 사진 영역의 프린터 dot 크기"""
+    dpi = dpi or Config.PRINTER_DPI
+    return int(Config.PHOTO_WIDTH * dpi / 25.4), int(Config.PHOTO_HEIGHT * dpi / 25.4)
+
+
+def to_rgb(image_bgr):
+    """카메라 BGR 프레임을 RGB로 변환 (새 배열 반환)"""
+    return cv2.cvtColor(image_bgr, cv2.COLOR_BGR2RGB)
+
+
+def rotate(image, angle):
+    """이미지 중심 기준 회전 (크기 유지)"""
+    if angle == 0:
+        return image
+    height, width = image.shape[:2]
+    matrix = cv2.getRotationMatrix2D((width / 2, height / 2), angle, 1)
+    return cv2.warpAffine(image, matrix, (width, height))
+
+
+def display_size(image_size, frame_size, zoom):
+    """preview 프레임에 맞춰 확대한 이미지 크기 (소수점 포함)"""
+    img_width, img_height = image_size
+    frame_width, frame_height = frame_size
+    frame_ratio = frame_width / frame_height
+    image_ratio = img_width / img_height
+
+    if image_ratio > frame_ratio:
+        # 이미지가 더 넓은 경우
+        display_width = frame_width * zoom
+        display_height = display_width / image_ratio
+    else:
+        # 이미지가 더 높은 경우
+        display_height = frame_height * zoom
+        display_width = display_height * image_ratio
+    return display_width, display_height
+
+
+def crop_box(display, frame_size, offset):
+    """preview 중심과 이동 offset을 고려한 크롭 영역 (이미지 범위로 제한)"""
+    display_width, display_height = display
+    frame_width, frame_height = frame_size
+    x_center = (display_width / 2) - offset[0]
+    y_center = (display_height / 2) - offset[1]
+
+    width, height = int(display_width), int(display_height)
+    x1 = max(0, min(int(x_center - frame_width / 2), width))
+    y1 = max(0, min(int(y_center - frame_height / 2), height))
+    x2 = max(0, min(int(x_center + frame_width / 2), width))
+    y2 = max(0, min(int(y_center + frame_height / 2), height))
+    return x1, y1, x2, y2
+
+
+def crop_photo(image_bgr, frame_size, rotation_angle=0, zoom=1.0, offset=(0, 0), dpi=None):
+    """preview에 보이는 영역을 잘라 카드 사진 크기(PIL RGB)로 반환
+
+    image_bgr: 카메라 원본 프레임, frame_size: preview 프레임 (너비, 높이),
+    offset: 드래그로 이동한 (x, y)
+    """
+    image_rgb = rotate(to_rgb(image_bgr), rotation_angle)
+    img_height, img_width = image_rgb.shape[:2]
+
+    display = display_size((img_width, img_height), frame_size, zoom)
+    resized = cv2.resize(image_rgb, (int(display[0]), int(display[1])))
+
+    x1, y1, x2, y2 = crop_box(display, frame_size, offset)
+    cropped = Image.fromarray(resized[y1:y2, x1:x2])
+
+    # 프린터 출력 해상도에 맞게 최종 크기 조정
+    return resize(cropped, print_photo_size(dpi))
@@ -0,0 +1,89 @@
+import argparse
+import logging
+import os
+
+import pandas as pd
+from config import Config
+from utils.excel import ExcelManager
+
+REASON_MISSING = '이름/생년월일 누락'
+REASON_INTERNAL = '파일 내 중복'
+REASON_REGISTERED = '이미 등록됨'
+
+
+def load_preregistration(path):
+    """사전 등록 명단 읽기 (CSV 또는 XLSX)"""
+    if os.path.splitext(path)[1].lower() == '.csv':
+        df = pd.read_csv(path, dtype=str, encoding='utf-8-sig')
+    else:
+        df = pd.read_excel(path, dtype=str)
+
+    missing = [column for column in ('이름', '생년월일') if column not in df.columns]
+    if missing:
+        raise ValueError(f"필수 컬럼이 없습니다: {', '.join(missing)}")
+    return df
+
+
+def find_conflicts(df, existing_keys):
+    """누락, 파일 내 중복, 기존 등록 충돌을 한 번에 판별 - 행별 사유 Series 반환 (정상은 빈 문자열)"""
+    # check_duplicate와 같은 방식으로 정규화
+    names = df['이름'].fillna('').str.strip()
+    birthdates = df['생년월일'].fillna('').str.strip()
+    keys = pd.MultiIndex.from_arrays([names, birthdates])
+
+    missing = (names == '') | (birthdates == '')
+    registered = keys.isin(list(existing_keys))
+    internal = keys.duplicated(keep='first')
+
+    reasons = pd.Series('', index=df.index)
+    reasons[internal] = REASON_INTERNAL
+    reasons[registered] = REASON_REGISTERED
+    reasons[missing] = REASON_MISSING
+    return reasons
+
+
+def import_preregistration(path, report_path=None):
+    """사전 등록 명단 가져오기 - 충돌 항목은 보고서로 저장하고 나머지는 한 번에 저장"""
+    df = load_preregistration(path)
+    reasons = find_conflicts(df, ExcelManager.existing_keys())
+
+    clean = df[reasons == '']
+    conflicts = df[reasons != ''].assign(사유=reasons[reasons != ''])
+
+    if len(conflicts):
+        report_path = report_path or os.path.splitext(path)[0] + '_conflicts.csv'
+        conflicts.to_csv(report_path, index=False, encoding='utf-8-sig')
+
+    visitors = zip(clean['이름'].str.strip(), clean['생년월일'].str.strip())
+    imported = ExcelManager.save_visitors(visitors) if len(clean) else 0
+
+    logging.info(f"Pre-registration imported from {path}: {imported} imported, {len(conflicts)} conflicts")
+    return {
+        'total': len(df),
+        'imported': imported,
+        'conflicts': len(conflicts),
+        'report_path': report_path if len(conflicts) else None
+    }
+
+
+def main():
+    """사전 등록 명단 가져오기 명령 (src 폴더에서 python -m utils.preregistration 으로 실행)"""
+    parser = argparse.ArgumentParser(description="사전 등록 명단 가져오기")
+    parser.add_argument('path', help="CSV 또는 XLSX 파일 (이름, 생년월일 컬럼 필수)")
+    parser.add_argument('--report', help="충돌 보고서 경로 (기본: <파일명>_conflicts.csv)")
+    args = parser.parse_args()
+
+    Config.initialize_directories()
+    ExcelManager.initialize()
+    result = import_preregistration(args.path, args.report)
+
+    print(f"전체 {result['total']}건 중 {result['imported']}건 등록, {result['conflicts']}건 충돌")
+    if result['report_path']:
+        print(f"충돌 보고서: {result['report_path']}")
+
+    # 엑셀 저장소는 저널 병합이 끝날 때까지 대기
+    ExcelManager.compact()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+import time
+from collections import deque
+
+import cv2
+import numpy as np
+from config import Config
+
+# 움직임 판단용 축소 크기
+MOTION_SIZE = (32, 18)
+
+
+def fit_size(frame_size, box_size):
+    """비율을 유지하며 box 안에 들어가는 크기"""
+    frame_width, frame_height = frame_size
+    box_width, box_height = box_size
+    scale = min(box_width / frame_width, box_height / frame_height)
+    return max(1, int(frame_width * scale)), max(1, int(frame_height * scale))
+
+
+class PreviewScaler:
+    """카메라 프레임을 미리보기 크기로 줄이는 버퍼 재사용 변환기
+
+    원본 프레임을 먼저 미리보기 크기로 줄이고(INTER_AREA) 색 변환 없이 BGR 그대로 둔다.
+    결과는 매번 같은 버퍼에 쓰므로 프레임마다 새 배열을 만들지 않는다.
+    """
+
+    def __init__(self, box_size=None):
+        self.box_size = box_size or (Config.PREVIEW_WIDTH, Config.PREVIEW_HEIGHT)
+        self.frame_size = None
+        self.buffer = None
+
+    def _allocate(self, frame_size):
+        width, height = fit_size(frame_size, self.box_size)
+        self.frame_size = frame_size
+        self.buffer = np.empty((height, width, 3), dtype=np.uint8)
+
+    def scale(self, frame):
+        """frame(BGR)을 줄인 결과 버퍼 반환 - 다음 호출 때 덮어쓰므로 보관하려면 복사"""
+        frame_size = (frame.shape[1], frame.shape[0])
+        if frame_size != self.frame_size:
+            self._allocate(frame_size)
+
+        height, width = self.buffer.shape[:2]
+        if frame_size == (width, height):
+            np.copyto(self.buffer, frame)
+        else:
+            cv2.resize(frame, (width, height), dst=self.buffer, interpolation=cv2.INTER_AREA)
+        return self.buffer
+
+
+def percentile(sorted_values, percent):
+    """정렬된 값 목록의 백분위수 (가장 가까운 순위)"""
+    index = min(len(sorted_values) - 1, int(round(percent / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class PreviewPacer:
+    """미리보기 표시 fps 조절 및 성능 집계
+
+    최근 프레임 처리 시간 p95가 프레임 예산의 80%를 넘으면 fps를 낮추고, 40% 아래로 내려가면
+    목표 fps까지 다시 올린다. 표본이 min_samples개 모이기 전에는 조정하지 않고, 가장 느린 한 프레임은
+    빼고 계산하여 시작 직후나 GC 등 한 번의 지연으로 fps가 내려가지 않게 한다.
+    일정 시간 카메라 앞에 움직임이 없으면 유휴 fps로 낮춘다.
+    """
+
+    def __init__(self, target_fps=None, min_fps=None, idle_fps=None, idle_seconds=None, window=60, min_samples=30):
+        self.target_fps = target_fps or Config.CAMERA_FPS
+        self.min_fps = min(min_fps or Config.PREVIEW_MIN_FPS, self.target_fps)
+        self.idle_fps = idle_fps or Config.PREVIEW_IDLE_FPS
+        self.idle_seconds = Config.PREVIEW_IDLE_SECONDS if idle_seconds is None else idle_seconds
+        self.fps = self.target_fps
+        self.idle = False
+        self.min_samples = min(min_samples, window)
+
+        self._process_ms = deque(maxlen=window)
+        self._shown = deque(maxlen=window)
+        self._motion_reference = None
+        self._last_motion = time.monotonic()
+
+    @property
+    def interval_ms(self):
+        """현재 표시 간격 (QTimer용)"""
+        return int(1000 / (self.idle_fps if self.idle else self.fps))
+
+    def wake(self):
+        """유휴 상태 해제 (촬영 버튼 등 사용자 입력 시)"""
+        self._last_motion = time.monotonic()
+        changed = self.idle
+        self.idle = False
+        return changed
+
+    def _detect_motion(self, preview):
+        small = cv2.cvtColor(cv2.resize(preview, MOTION_SIZE, interpolation=cv2.INTER_AREA), cv2.COLOR_BGR2GRAY)
+        reference, self._motion_reference = self._motion_reference, small
+        if reference is None:
+            return True
+        return cv2.absdiff(small, reference).mean() >= Config.PREVIEW_MOTION_THRESHOLD
+
+    def record(self, process_ms, preview, now=None):
+        """표시한 프레임 하나 기록 - 표시 간격이 바뀌면 True"""
+        now = time.monotonic() if now is None else now
+        previous = self.interval_ms
+        self._process_ms.append(process_ms)
+        self._shown.append(now)
+
+        if self._detect_motion(preview):
+            self._last_motion = now
+            self.idle = False
+        elif self.idle_seconds and now - self._last_motion >= self.idle_seconds:
+            self.idle = True
+
+        # 표본이 충분히 모이면 처리 시간에 맞춰 fps 조정 (조정 후에는 새로 측정)
+        if len(self._process_ms) >= self.min_samples:
+            p95 = percentile(sorted(self._process_ms)[:-1], 95)
+            budget = 1000 / self.fps
+            if p95 > budget * 0.8 and self.fps > self.min_fps:
+                self.fps = max(self.min_fps, int(self.fps * 0.75))
+                self._process_ms.clear()
+            elif p95 < budget * 0.4 and self.fps < self.target_fps:
+                self.fps = min(self.target_fps, self.fps + 5)
+                self._process_ms.clear()
+
+        return self.interval_ms != previous
+
+    def stats(self):
+        """집계 - fps(실제 표시), target_fps, process_p50/p95(ms), idle"""
+        shown = list(self._shown)
+        fps = (len(shown) - 1) / (shown[-1] - shown[0]) if len(shown) > 1 and shown[-1] > shown[0] else 0.0
+        samples = sorted(self._process_ms)
+        return {
+            'fps': round(fps, 1),
+            'target_fps': self.idle_fps if self.idle else self.fps,
+            'process_p50': round(percentile(samples, 50), 2) if samples else 0.0,
+            'process_p95': round(percentile(samples, 95), 2) if samples else 0.0,
+            'idle': self.idle,
+        }
@@ -0,0 +1,329 @@
+import itertools
+import logging
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+from datetime import datetime
+
+from config import Config
+from utils.files import write_atomic
+
+DOC_TITLE = '명예군민증'
+
+
+def image_dpi(image):
+    """이미지에 기록된 해상도 (없으면 Config.PRINTER_DPI)"""
+    return image.info.get('dpi', (Config.PRINTER_DPI, Config.PRINTER_DPI))
+
+
+class Win32PrinterSession:
+    """Windows 기본 프린터 연결 유지 (프린터 이름, 핸들, DC, 출력 영역을 한 번만 준비)"""
+
+    # GetDeviceCaps 인덱스
+    HORZRES = 8
+    VERTRES = 10
+    LOGPIXELSX = 88
+    LOGPIXELSY = 90
+    PRINTER_ATTRIBUTE_WORK_OFFLINE = 0x400
+
+    # PRINTER_INFO_2.Status 중 출력할 수 없는 상태 (인쇄 중, 예열, 절전 등 나머지는 정상 동작)
+    PRINTER_FAULTS = {
+        0x2: '오류',
+        0x8: '용지 걸림',
+        0x10: '용지 없음',
+        0x40: '용지 문제',
+        0x80: '오프라인',
+        0x800: '출력함 가득 참',
+        0x1000: '사용할 수 없음',
+        0x40000: '토너 없음',
+        0x100000: '사용자 조치 필요',
+        0x400000: '덮개 열림',
+    }
+
+    def __init__(self):
+        self.printer_name = None
+        self.capabilities = {}
+        self._hprinter = None
+        self._hdc = None
+
+    @property
+    def is_open(self):
+        return self._hdc is not None
+
+    def open(self):
+        import win32print
+        import win32ui
+
+        self.printer_name = win32print.GetDefaultPrinter()
+        self._hprinter = win32print.OpenPrinter(self.printer_name)
+        self._hdc = win32ui.CreateDC()
+        self._hdc.CreatePrinterDC(self.printer_name)
+        self.capabilities = {
+            'width': self._hdc.GetDeviceCaps(self.HORZRES),
+            'height': self._hdc.GetDeviceCaps(self.VERTRES),
+            'dpi_x': self._hdc.GetDeviceCaps(self.LOGPIXELSX),
+            'dpi_y': self._hdc.GetDeviceCaps(self.LOGPIXELSY),
+        }
+        logging.info(f"Printer session opened: {self.printer_name} {self.capabilities}")
+
+    def close(self):
+        import win32print
+
+        try:
+            if self._hdc is not None:
+                self._hdc.DeleteDC()
+            if self._hprinter is not None:
+                win32print.ClosePrinter(self._hprinter)
+        except Exception as e:
+            logging.warning(f"Printer session close failed: {e}")
+        finally:
+            self._hdc = None
+            self._hprinter = None
+
+    def draw(self, image, title):
+        from PIL import ImageWin
+
+        self._hdc.StartDoc(title)
+        self._hdc.StartPage()
+
+        # 카드 해상도와 프린터 해상도가 달라도 실제 크기(mm)로 출력
+        dpi_x, dpi_y = image_dpi(image)
+        width = round(image.width * self.capabilities['dpi_x'] / dpi_x)
+        height = round(image.height * self.capabilities['dpi_y'] / dpi_y)
+
+        dib = ImageWin.Dib(image)
+        dib.draw(self._hdc.GetHandleOutput(), (0, 0, width, height))
+
+        self._hdc.EndPage()
+        self._hdc.EndDoc()
+
+    def query_status(self):
+        """스풀러에 프린터 상태 조회 - (사용 가능 여부, 안내 문구)"""
+        import win32print
+
+        info = win32print.GetPrinter(self._hprinter, 2)
+        if info['Attributes'] & self.PRINTER_ATTRIBUTE_WORK_OFFLINE:
+            return False, f"{self.printer_name}: 오프라인"
+        faults = [text for bit, text in self.PRINTER_FAULTS.items() if info['Status'] & bit]
+        if faults:
+            return False, f"{self.printer_name}: {', '.join(faults)} (상태 코드 {info['Status']:#x})"
+        return True, f"{self.printer_name}: 준비됨 (대기 {info['cJobs']}건)"
+
+
+class MockPrinterSession:
+    """실제 프린터 없이 연결 유지/재연결 동작을 흉내내는 세션 (Linux 테스트용)"""
+
+    def __init__(self):
+        self.printer_name = 'Mock Printer'
+        self.capabilities = {'width': 685, 'height': 1062, 'dpi_x': Config.PRINTER_DPI, 'dpi_y': Config.PRINTER_DPI}
+        self.online = True
+        self.fail_next = 0
+        self.open_count = 0
+        self.documents = []
+        self._open = False
+
+    @property
+    def is_open(self):
+        return self._open
+
+    def open(self):
+        if not self.online:
+            raise OSError("프린터가 오프라인입니다")
+        self.open_count += 1
+        self._open = True
+
+    def close(self):
+        self._open = False
+
+    def draw(self, image, title):
+        if not self.online:
+            raise OSError("프린터가 오프라인입니다")
+        if self.fail_next:
+            self.fail_next -= 1
+            raise OSError("스풀러 응답 없음")
+        self.documents.append((title, image.size))
+
+    def query_status(self):
+        if not self.online:
+            return False, f"{self.printer_name}: 오프라인"
+        return True, f"{self.printer_name}: 준비됨"
+
+
+class SessionPrintBackend:
+    """프린터 세션을 유지하며 출력 - 오류 시 한 번 재연결 후 재시도"""
+
+    def __init__(self, session):
+        self.session = session
+        self._lock = threading.Lock()
+        self._status = (False, "프린터 확인 중")
+
+    def print_image(self, image, title=DOC_TITLE):
+        with self._lock:
+            try:
+                if not self.session.is_open:
+                    self.session.open()
+                self.session.draw(image, title)
+            except Exception as e:
+                logging.warning(f"Printer session error, reconnecting: {e}")
+                self.session.close()
+                try:
+                    self.session.open()
+                    self.session.draw(image, title)
+                except Exception as e:
+                    self.session.close()
+                    self._status = (False, f"프린터 오류: {e}")
+                    raise
+            self._status = (True, f"{self.session.printer_name}: 준비됨")
+
+    def refresh_status(self):
+        """프린터 상태를 다시 조회하여 캐시 갱신"""
+        with self._lock:
+            try:
+                if not self.session.is_open:
+                    self.session.open()
+                self._status = self.session.query_status()
+            except Exception as e:
+                self.session.close()
+                self._status = (False, f"프린터 연결 안 됨: {e}")
+            return self._status
+
+    def status(self):
+        """마지막으로 확인한 프린터 상태 (조회 없이 반환)"""
+        return self._status
+
+    def close(self):
+        with self._lock:
+            self.session.close()
+
+
+class Win32PrintBackend(SessionPrintBackend):
+    """Windows 기본 프린터로 GDI 출력"""
+    name = 'win32'
+
+    def __init__(self):
+        super().__init__(Win32PrinterSession())
+
+
+class MockPrintBackend(SessionPrintBackend):
+    """가상 프린터 (Linux에서 세션/재연결 동작 시험용)"""
+    name = 'mock'
+
+    def __init__(self):
+        super().__init__(MockPrinterSession())
+
+    def print_pdf(self, data, title=DOC_TITLE):
+        with self._lock:
+            self.session.documents.append((title, len(data)))
+
+
+class LprPrintBackend:
+    """CUPS lpr 명령으로 출력 (Linux/macOS)"""
+    name = 'lpr'
+
+    def __init__(self, printer_name=None):
+        self.printer_name = printer_name or Config.PRINTER_NAME
+        self._status = (False, "프린터 확인 중")
+
+    def refresh_status(self):
+        """lpstat으로 프린터 상태 조회하여 캐시 갱신"""
+        lpstat = shutil.which('lpstat')
+        if lpstat is None:
+            self._status = (False, "CUPS가 설치되어 있지 않습니다")
+            return self._status
+
+        command = [lpstat, '-p', self.printer_name] if self.printer_name else [lpstat, '-d']
+        result = subprocess.run(command, timeout=5, capture_output=True, text=True)
+        output = result.stdout.strip() or result.stderr.strip()
+        available = result.returncode == 0 and 'disabled' not in output
+        self._status = (available, output)
+        return self._status
+
+    def status(self):
+        """마지막으로 확인한 프린터 상태"""
+        return self._status
+
+    def close(self):
+        pass
+
+    def print_image(self, image, title=DOC_TITLE):
+        lpr = shutil.which('lpr')
+        if lpr is None:
+            raise RuntimeError("lpr 명령을 찾을 수 없습니다 (CUPS 설치 필요)")
+
+        command = [lpr, '-T', title, '-o', 'fit-to-page']
+        if self.printer_name:
+            command += ['-P', self.printer_name]
+
+        fd, path = tempfile.mkstemp(suffix='.png')
+        os.close(fd)
+        try:
+            image.save(path, dpi=image_dpi(image))
+            subprocess.run(command + [path], check=True, timeout=30, capture_output=True)
+        finally:
+            os.remove(path)
+
+    def print_pdf(self, data, title=DOC_TITLE):
+        """PDF를 그대로 전달 (CUPS가 프린터 해상도로 변환)"""
+        lpr = shutil.which('lpr')
+        if lpr is None:
+            raise RuntimeError("lpr 명령을 찾을 수 없습니다 (CUPS 설치 필요)")
+
+        command = [lpr, '-T', title]
+        if self.printer_name:
+            command += ['-P', self.printer_name]
+        subprocess.run(command, input=data, check=True, timeout=30, capture_output=True)
+
+
+class FileSpoolBackend:
+    """프린터 대신 폴더에 PNG로 저장 (테스트 및 성능 측정용)"""
+    name = 'file'
+
+    def __init__(self, spool_dir=None):
+        self.spool_dir = spool_dir or Config.FILE_PRINTER_DIR
+        self._counter = itertools.count(1)
+        self._lock = threading.Lock()
+        os.makedirs(self.spool_dir, exist_ok=True)
+
+    def refresh_status(self):
+        return self.status()
+
+    def status(self):
+        return True, f"파일 출력: {self.spool_dir}"
+
+    def close(self):
+        pass
+
+    def _next_path(self, extension):
+        with self._lock:
+            sequence = next(self._counter)
+        filename = f"{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}_{os.getpid()}_{sequence:06d}{extension}"
+        return os.path.join(self.spool_dir, filename)
+
+    def print_image(self, image, title=DOC_TITLE):
+        path = self._next_path('.png')
+        write_atomic(path, lambda f: image.save(f, format='PNG', dpi=image_dpi(image)))
+        return path
+
+    def print_pdf(self, data, title=DOC_TITLE):
+        path = self._next_path('.pdf')
+        write_atomic(path, lambda f: f.write(data))
+        return path
+
+
+PRINT_BACKENDS = {
+    Win32PrintBackend.name: Win32PrintBackend,
+    LprPrintBackend.name: LprPrintBackend,
+    FileSpoolBackend.name: FileSpoolBackend,
+    MockPrintBackend.name: MockPrintBackend,
+}
+
+
+def get_print_backend(name=None):
+    """설정에 맞는 출력 방식 생성 (Config.PRINT_BACKEND)"""
+    name = name or Config.PRINT_BACKEND
+    if name not in PRINT_BACKENDS:
+        raise ValueError(f"알 수 없는 출력 방식: {name}")
+    logging.info(f"Print backend: {name}")
+    return PRINT_BACKENDS[name]()
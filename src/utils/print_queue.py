@@ -0,0 +1,281 @@
+import logging
+import os
+import queue
+import threading
+import time
+import uuid
+
+from PyQt6.QtCore import QObject, pyqtSignal
+from config import Config
+from utils.card_printer import get_card_printer
+from utils.print_spool import PrintSpool
+
+# 작업 상태
+SAVING = 'saving'
+QUEUED = 'queued'
+RENDERING = 'rendering'
+PRINTING = 'printing'
+DONE = 'done'
+FAILED = 'failed'
+
+
+class PrintJob:
+    def __init__(self, name, birthdate, photo, job_id=None, output_path=None, created_at=None, register=None):
+        self.id = job_id or uuid.uuid4().hex[:12]
+        self.name = name
+        self.birthdate = birthdate
+        self.photo = photo
+        self.register = register
+        self.state = QUEUED
+        self.attempts = 0
+        self.output_path = output_path
+        self.error = None
+        self.created_at = created_at or time.time()
+
+
+class PrintQueue(QObject):
+    """전용 작업 스레드에서 카드를 생성/출력하는 출력 대기열
+
+    작업 추가는 메모리 대기열에 넣기만 하고, 스풀 기록(사진 인코딩, 디스크 동기화)과 방문자 등록은
+    저장 스레드에서, 카드 생성/출력은 출력 스레드에서 처리한다. 출력이 밀려 있어도 저장은 기다리지 않는다.
+    """
+
+    # (작업 ID, 상태)
+    job_state_changed = pyqtSignal(str, str)
+    # (작업 ID, 성공 여부, 오류 메시지) - 스풀 기록과 방문자 등록이 끝난 뒤
+    job_saved = pyqtSignal(str, bool, str)
+    # (작업 ID, 성공 여부, 저장 경로 또는 오류 메시지)
+    job_finished = pyqtSignal(str, bool, str)
+    # (사용 가능 여부, 안내 문구)
+    printer_status_changed = pyqtSignal(bool, str)
+
+    # 대기열이 비어 있을 때 프린터 상태를 확인하는 간격 (초)
+    STATUS_INTERVAL = 10
+
+    def __init__(self, printer=None, max_retries=None, retry_backoff=None, spool=None):
+        super().__init__()
+        self.printer = printer or get_card_printer()
+        self.spool = spool or PrintSpool()
+        self.max_retries = Config.PRINT_MAX_RETRIES if max_retries is None else max_retries
+        self.retry_backoff = Config.PRINT_RETRY_BACKOFF if retry_backoff is None else retry_backoff
+
+        self._queue = queue.Queue()
+        self._save_queue = queue.Queue()
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self._saver = threading.Thread(target=self._run_saver, name='print-spool', daemon=True)
+        self._saver.start()
+        self._worker = threading.Thread(target=self._run, name='print-queue', daemon=True)
+        self._worker.start()
+
+    def submit(self, name, birthdate, photo, register=None):
+        """출력 작업 추가 - 작업 ID 반환 (디스크 기록을 기다리지 않음)
+
+        저장 스레드가 작업을 스풀에 기록하고 register(name, birthdate)로 방문자를 등록한 뒤
+        job_saved로 결과를 알린다. 등록에 실패(False 또는 예외)하면 작업을 취소하고 출력하지 않는다.
+        """
+        job = PrintJob(name, birthdate, photo, register=register)
+        job.state = SAVING
+        with self._lock:
+            self._jobs[job.id] = job
+        self._save_queue.put(job)
+        self.job_state_changed.emit(job.id, SAVING)
+        return job.id
+
+    def _run_saver(self):
+        while True:
+            job = self._save_queue.get()
+            if job is None:
+                break
+            try:
+                self._save(job)
+            except Exception as e:
+                logging.error(f"Print job {job.id} could not be saved: {e}", exc_info=True)
+                job.error = str(e)
+                job.photo = None
+                self._set_state(job, FAILED)
+                self.job_saved.emit(job.id, False, job.error)
+                self._prune()
+
+    def _save(self, job):
+        """출력 전에 디스크에 먼저 보관 (비정상 종료 시 재시작 후 다시 출력)한 뒤 방문자 등록"""
+        self.spool.add(job)
+        register, job.register = job.register, None
+        if register is not None:
+            try:
+                registered = register(job.name, job.birthdate)
+            except Exception:
+                self.spool.cancel(job.id)
+                raise
+            if not registered:
+                self.spool.cancel(job.id)
+                raise RuntimeError("방문자 등록 실패")
+
+        self.job_saved.emit(job.id, True, '')
+        self._enqueue(job)
+        logging.info(f"Print job queued: {job.id}")
+
+    def _enqueue(self, job):
+        with self._lock:
+            self._jobs[job.id] = job
+        job.state = QUEUED
+        self._queue.put(job)
+        self.job_state_changed.emit(job.id, QUEUED)
+
+    def recover(self, register=None):
+        """이전 실행에서 끝나지 않은 작업을 다시 대기열에 추가 - 복구한 작업 수 반환
+
+        register(name, birthdate)를 주면 작업마다 호출 (스풀 기록 후 방문자 등록 전에 종료된 작업 등록용)
+        """
+        recovered = 0
+        for meta in self.spool.recover():
+            if register is not None:
+                try:
+                    register(meta['name'], meta['birthdate'])
+                except Exception as e:
+                    logging.error(f"Failed to register visitor for recovered job {meta['id']}: {e}")
+            # 사진은 작업을 처리할 때 스풀에서 읽음
+            job = PrintJob(meta['name'], meta['birthdate'], None, job_id=meta['id'],
+                           output_path=meta.get('output_path'), created_at=meta.get('created_at'))
+            self._enqueue(job)
+            recovered += 1
+            logging.info(f"Print job recovered: {job.id}")
+        return recovered
+
+    def get_job(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def pending_count(self):
+        """완료되지 않은 작업 수"""
+        with self._lock:
+            return sum(job.state not in (DONE, FAILED) for job in self._jobs.values())
+
+    def wait_idle(self, timeout=None):
+        """대기 중인 작업이 모두 끝날 때까지 대기"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self.pending_count():
+            if deadline is not None and time.monotonic() > deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def printer_status(self):
+        """마지막으로 확인한 프린터 상태 (프린터에 다시 묻지 않음)"""
+        return self.printer.printer_status()
+
+    def stop(self, timeout=None):
+        """남은 작업을 저장/처리한 뒤 작업 스레드 종료"""
+        self._save_queue.put(None)
+        self._saver.join(timeout)
+        self._queue.put(None)
+        self._worker.join(timeout)
+        self.printer.close()
+
+    def _set_state(self, job, state):
+        job.state = state
+        self.job_state_changed.emit(job.id, state)
+
+    def _refresh_status(self):
+        """작업 스레드에서 프린터 상태를 조회하고 바뀌었으면 알림"""
+        previous = self.printer.printer_status()
+        try:
+            current = self.printer.refresh_printer_status()
+        except Exception as e:
+            logging.warning(f"Printer status query failed: {e}")
+            return
+        if current != previous:
+            self.printer_status_changed.emit(*current)
+
+    def _run(self):
+        self._refresh_status()
+        while True:
+            try:
+                job = self._queue.get(timeout=self.STATUS_INTERVAL)
+            except queue.Empty:
+                self._refresh_status()
+                continue
+            if job is None:
+                break
+            try:
+                self._process(job)
+            except Exception as e:
+                logging.error(f"Print job {job.id} crashed: {e}", exc_info=True)
+                job.error = str(e)
+                self._set_state(job, FAILED)
+                self.job_finished.emit(job.id, False, job.error)
+            finally:
+                self._emit_status()
+                # 완료된 작업은 사진을 더 이상 들고 있지 않음
+                job.photo = None
+                self._prune()
+
+    def _emit_status(self):
+        """출력 결과로 갱신된 프린터 상태 알림"""
+        self.printer_status_changed.emit(*self.printer.printer_status())
+
+    def _prune(self, keep=200):
+        """끝난 작업 기록은 최근 keep개만 유지"""
+        with self._lock:
+            finished = [job for job in self._jobs.values() if job.state in (DONE, FAILED)]
+            for job in sorted(finished, key=lambda job: job.created_at)[:-keep]:
+                del self._jobs[job.id]
+
+    def _process(self, job):
+        self._set_state(job, RENDERING)
+        if job.photo is None:
+            try:
+                job.photo = self.spool.load_photo(job.id)
+            except (OSError, ValueError) as e:
+                # 손상된 사진은 다시 시도해도 복구할 수 없으므로 스풀에서 제거
+                logging.error(f"Print spool photo for {job.id} is unreadable, dropping job: {e}")
+                self.spool.cancel(job.id)
+                raise
+        card = self.printer.render(job.name, job.birthdate, job.photo)
+
+        # 보관 이미지는 백그라운드에서 기록 (복구된 작업은 이미 저장된 경우 다시 저장하지 않음)
+        # 출력 방식도 같은 이미지를 저장하므로 보관용으로는 복사본을 넘김 (PIL 이미지는 동시 저장 불가)
+        archived = job.output_path is None or not os.path.exists(job.output_path)
+        if archived:
+            job.output_path = self.printer.save_card(card.copy(), job.name, job.output_path, job.birthdate, job.photo)
+
+        # 출력 실패 시 대기 시간을 늘려가며 재시도
+        while True:
+            job.attempts += 1
+            self._set_state(job, PRINTING)
+            try:
+                self.printer.print_output(card, job.name, job.birthdate, job.photo)
+                break
+            except Exception as e:
+                job.error = str(e)
+                if job.attempts > self.max_retries:
+                    logging.error(f"Print job {job.id} failed after {job.attempts} attempts: {e}")
+                    if archived:
+                        self.spool.record_output(job)
+                    self._set_state(job, FAILED)
+                    self.job_finished.emit(job.id, False, job.error)
+                    return
+                delay = self.retry_backoff * (2 ** (job.attempts - 1))
+                logging.warning(f"Print job {job.id} attempt {job.attempts} failed, retrying in {delay:.1f}s: {e}")
+                time.sleep(delay)
+
+        # 보관 경로 기록(디스크 동기화)은 출력을 늦추지 않도록 출력 후에 진행
+        if archived:
+            self.spool.record_output(job)
+
+        job.error = None
+        self.spool.mark_done(job.id)
+        self._set_state(job, DONE)
+        self.job_finished.emit(job.id, True, job.output_path)
+        logging.info(f"Print job done: {job.id} ({job.output_path})")
+
+
+_print_queue = None
+
+
+def get_print_queue():
+    """프로세스 공용 출력 대기열 반환"""
+    global _print_queue
+    if _print_queue is None:
+        _print_queue = PrintQueue()
+    return _print_queue
@@ -0,0 +1,126 @@
+import json
+import logging
+import os
+import shutil
+import threading
+
+from PIL import Image
+from config import Config
+from utils.files import write_atomic
+
+
+class PrintSpool:
+    """출력 전 작업을 디스크에 보관하여 비정상 종료 후에도 다시 출력할 수 있게 하는 스풀
+
+    jobs/<작업ID>/ 에 사진과 메타데이터(보관 이미지 경로 포함)를 저장하고
+    index.log 에 'queued <ID>' / 'done <ID>' / 'cancelled <ID>' 를 추가로 기록한다.
+    복구 시에는 index.log 만 읽으므로 폴더 전체를 훑지 않는다.
+    """
+
+    def __init__(self, spool_dir=None):
+        self.spool_dir = spool_dir or Config.PRINT_SPOOL_DIR
+        self.jobs_dir = os.path.join(self.spool_dir, 'jobs')
+        self.index_path = os.path.join(self.spool_dir, 'index.log')
+        self._lock = threading.Lock()
+        os.makedirs(self.jobs_dir, exist_ok=True)
+
+    def _job_dir(self, job_id):
+        return os.path.join(self.jobs_dir, job_id)
+
+    def _append_index(self, state, job_id):
+        with self._lock:
+            with open(self.index_path, 'a', encoding='utf-8') as f:
+                f.write(f'{state} {job_id}\n')
+                f.flush()
+                os.fsync(f.fileno())
+
+    def add(self, job):
+        """작업 저장 (사진 -> 메타데이터 -> 인덱스 순서로 기록)"""
+        job_dir = self._job_dir(job.id)
+        os.makedirs(job_dir, exist_ok=True)
+
+        write_atomic(os.path.join(job_dir, 'photo.png'),
+                     lambda f: job.photo.save(f, format='PNG', compress_level=1))
+        self._write_meta(job)
+        self._append_index('queued', job.id)
+
+    def _write_meta(self, job):
+        meta = {
+            'id': job.id,
+            'name': job.name,
+            'birthdate': job.birthdate,
+            'created_at': job.created_at,
+            'output_path': job.output_path,
+        }
+        write_atomic(os.path.join(self._job_dir(job.id), 'meta.json'),
+                     lambda f: f.write(json.dumps(meta, ensure_ascii=False).encode('utf-8')))
+
+    def record_output(self, job):
+        """보관 이미지 경로 기록 (복구 시 같은 경로로 저장하여 중복 파일이 생기지 않도록)"""
+        self._write_meta(job)
+
+    def mark_done(self, job_id):
+        """출력 완료 기록 후 작업 파일 삭제"""
+        self._append_index('done', job_id)
+        shutil.rmtree(self._job_dir(job_id), ignore_errors=True)
+
+    def cancel(self, job_id):
+        """출력하지 않을 작업 (방문자 등록 실패 등) 기록 후 작업 파일 삭제"""
+        self._append_index('cancelled', job_id)
+        shutil.rmtree(self._job_dir(job_id), ignore_errors=True)
+
+    def pending_ids(self):
+        """인덱스를 재생하여 완료되지 않은 작업 ID 목록 반환 (등록 순서)"""
+        pending = {}
+        if not os.path.exists(self.index_path):
+            return []
+
+        with open(self.index_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) != 2:
+                    continue
+                state, job_id = parts
+                if state == 'queued':
+                    pending[job_id] = True
+                elif state in ('done', 'cancelled'):
+                    pending.pop(job_id, None)
+        return list(pending)
+
+    def load_meta(self, job_id):
+        """작업 메타데이터 읽기 (사진 파일이 없으면 OSError)"""
+        job_dir = self._job_dir(job_id)
+        with open(os.path.join(job_dir, 'meta.json'), 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+
+        photo_path = os.path.join(job_dir, 'photo.png')
+        if not os.path.exists(photo_path):
+            raise FileNotFoundError(photo_path)
+        return meta
+
+    def load_photo(self, job_id):
+        """작업 사진 읽기 (출력할 때 작업 스레드에서 호출)"""
+        with Image.open(os.path.join(self._job_dir(job_id), 'photo.png')) as photo:
+            return photo.convert('RGB')
+
+    def compact_index(self, pending_ids):
+        """인덱스를 미완료 작업만 남도록 다시 기록"""
+        with self._lock:
+            write_atomic(self.index_path,
+                         lambda f: f.write(''.join(f'queued {job_id}\n' for job_id in pending_ids).encode('utf-8')))
+
+    def recover(self):
+        """미완료 작업의 메타데이터 목록 반환 (사진은 읽지 않으므로 작업이 많아도 메모리를 거의 쓰지 않음)"""
+        jobs = []
+        pending_ids = []
+        for job_id in self.pending_ids():
+            try:
+                jobs.append(self.load_meta(job_id))
+                pending_ids.append(job_id)
+            except (OSError, ValueError) as e:
+                # 사진/메타데이터 기록 중 종료된 작업은 복구 불가
+                logging.error(f"Print spool entry {job_id} is incomplete, skipping: {e}")
+                shutil.rmtree(self._job_dir(job_id), ignore_errors=True)
+
+        self.compact_index(pending_ids)
+        return jobs
@@ -0,0 +1,205 @@
+import argparse
+import logging
+import os
+import sqlite3
+import threading
+from datetime import datetime
+
+import pandas as pd
+from openpyxl import Workbook
+from config import Config
+from utils.files import write_atomic
+
+COLUMNS = ['이름', '생년월일', '등록일시']
+
+
+def normalize_key(name, birthdate):
+    """중복 체크용 키 정규화"""
+    return (str(name).strip(), str(birthdate).strip())
+
+
+def read_visitor_excel(excel_path):
+    """엑셀 파일의 방문자 목록 읽기 - [(이름, 생년월일, 등록일시), ...]"""
+    df = pd.read_excel(excel_path, dtype={'이름': str, '생년월일': str, '등록일시': str})
+    df = df.dropna(subset=['이름', '생년월일'])
+    if '등록일시' not in df.columns:
+        df['등록일시'] = None
+    df['등록일시'] = df['등록일시'].fillna(datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+    return list(zip(df['이름'], df['생년월일'], df['등록일시']))
+
+
+def write_visitor_excel(excel_path, chunks, total, progress=None):
+    """방문자 행 묶음을 쓰기 전용 모드로 엑셀 파일에 기록 - 기록한 행 수 반환"""
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    sheet.append(COLUMNS)
+
+    written = 0
+    for rows in chunks:
+        for row in rows:
+            sheet.append(row)
+        written += len(rows)
+        if progress:
+            progress(written, total)
+
+    write_atomic(excel_path, workbook.save)
+    return written
+
+
+class SQLiteRegistry:
+    """SQLite 기반 방문자 저장소 (정규화된 이름/생년월일에 유니크 인덱스)"""
+
+    def __init__(self, db_path=None):
+        self.db_path = db_path or Config.DB_PATH
+        self.created = not os.path.exists(self.db_path)
+        self._lock = threading.Lock()
+
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._create_schema()
+
+    def _create_schema(self):
+        """테이블 및 인덱스 생성"""
+        with self._lock, self._conn:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS visitors (
+                    id INTEGER PRIMARY KEY,
+                    name TEXT NOT NULL,
+                    birthdate TEXT NOT NULL,
+                    name_key TEXT NOT NULL,
+                    birthdate_key TEXT NOT NULL,
+                    registered_at TEXT NOT NULL
+                )
+            """)
+            self._conn.execute("""
+                CREATE UNIQUE INDEX IF NOT EXISTS idx_visitors_key
+                ON visitors (name_key, birthdate_key)
+            """)
+
+    def contains(self, name, birthdate):
+        """중복 여부 확인"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM visitors WHERE name_key = ? AND birthdate_key = ? LIMIT 1",
+                normalize_key(name, birthdate)
+            ).fetchone()
+        return row is not None
+
+    def add(self, name, birthdate, registered_at=None):
+        """방문자 추가 - 이미 등록된 경우 False 반환"""
+        registered_at = registered_at or datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        try:
+            with self._lock, self._conn:
+                self._conn.execute(
+                    "INSERT INTO visitors (name, birthdate, name_key, birthdate_key, registered_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (name, birthdate, *normalize_key(name, birthdate), registered_at)
+                )
+            return True
+        except sqlite3.IntegrityError:
+            return False
+
+    def add_many(self, records):
+        """여러 방문자를 하나의 트랜잭션으로 추가 - 추가된 수 반환"""
+        rows = [
+            (name, birthdate, *normalize_key(name, birthdate), registered_at)
+            for name, birthdate, registered_at in records
+        ]
+        with self._lock, self._conn:
+            before = self._conn.total_changes
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO visitors (name, birthdate, name_key, birthdate_key, registered_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                rows
+            )
+            return self._conn.total_changes - before
+
+    def keys(self):
+        """등록된 정규화 키 집합"""
+        with self._lock:
+            return set(self._conn.execute("SELECT name_key, birthdate_key FROM visitors"))
+
+    def count(self):
+        """등록된 방문자 수"""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM visitors").fetchone()[0]
+
+    def import_excel(self, excel_path):
+        """기존 엑셀 파일을 한 번에 가져오기 - (추가된 수, 건너뛴 수) 반환"""
+        records = read_visitor_excel(excel_path)
+        imported = self.add_many(records)
+        return imported, len(records) - imported
+
+    def iter_rows(self, chunk_size=5000):
+        """등록 순서대로 방문자 행을 chunk_size 단위로 반환"""
+        last_id = 0
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT id, name, birthdate, registered_at FROM visitors "
+                    "WHERE id > ? ORDER BY id LIMIT ?",
+                    (last_id, chunk_size)
+                ).fetchall()
+            if not rows:
+                return
+            last_id = rows[-1][0]
+            yield [row[1:] for row in rows]
+
+    def export_excel(self, excel_path=None, progress=None, chunk_size=5000):
+        """엑셀 파일로 내보내기 (직원 확인용) - 쓰기 전용 모드로 메모리 사용량 고정"""
+        return write_visitor_excel(excel_path or Config.EXCEL_PATH, self.iter_rows(chunk_size), self.count(), progress)
+
+    def close(self):
+        """DB 연결 종료"""
+        with self._lock:
+            self._conn.close()
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_registry():
+    """프로세스 공용 저장소 반환 (Config.REGISTRY_BACKEND에 따라 SQLite 또는 월별 분할 저장소)"""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            Config.initialize_directories()
+            if Config.REGISTRY_BACKEND == 'sharded':
+                from utils.sharded_registry import ShardedRegistry
+                _registry = ShardedRegistry()
+            else:
+                _registry = SQLiteRegistry()
+        return _registry
+
+
+def main():
+    """저장소 관리 명령 (src 폴더에서 python -m utils.registry 로 실행)"""
+    parser = argparse.ArgumentParser(description="방문자 저장소 관리")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    export_parser = subparsers.add_parser('export', help="visitors.xlsx 내보내기")
+    export_parser.add_argument('path', nargs='?', default=Config.EXCEL_PATH)
+
+    migrate_parser = subparsers.add_parser('migrate', help="기존 엑셀 파일 가져오기")
+    migrate_parser.add_argument('paths', nargs='*', default=[Config.EXCEL_PATH])
+
+    args = parser.parse_args()
+    registry = get_registry()
+
+    if args.command == 'export':
+        def print_progress(done, total):
+            print(f"\r내보내는 중... {done}/{total}", end='', flush=True)
+
+        count = registry.export_excel(args.path, progress=print_progress)
+        print(f"\n{count}건을 내보냈습니다: {args.path}")
+    elif args.command == 'migrate':
+        for path in args.paths:
+            imported, skipped = registry.import_excel(path)
+            logging.info(f"Registry migrated from {path}: {imported} imported, {skipped} skipped")
+            print(f"{path}: {imported}건 추가, {skipped}건 중복 제외")
+
+
+if __name__ == "__main__":
+    main()
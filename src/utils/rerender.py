@@ -0,0 +1,173 @@
+import argparse
+import logging
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from config import Config
+from utils.archive import ArchiveIndex, save_options
+from utils.card_template import CompiledTemplate, load_template
+from utils.excel import ExcelManager
+from utils.files import write_atomic
+from utils.registry import normalize_key
+
+CHECKPOINT_NAME = 'rerender.checkpoint'
+
+# 작업 프로세스별 상태 (프로세스마다 디자인을 한 번만 컴파일)
+_worker = {}
+
+
+def task_id(name, birthdate, issued_at):
+    """작업 ID - 방문자와 발급 시각 (보관 사진이 zip으로 옮겨져 경로가 바뀌어도 같음)"""
+    return '\t'.join((name, birthdate, issued_at))
+
+
+def read_checkpoint(output_dir):
+    """이미 끝난 작업 ID 목록"""
+    path = os.path.join(output_dir, CHECKPOINT_NAME)
+    if not os.path.exists(path):
+        return set()
+    with open(path, 'r', encoding='utf-8') as f:
+        return {line.rstrip('\n') for line in f if line.strip()}
+
+
+def plan_tasks(output_dir, archive_dir=None, extension='.jpg'):
+    """등록된 방문자와 보관 사진을 맞춰 작업 목록 생성 - (작업 목록, 사진 없는 방문자 수, 이미 끝난 작업 수)"""
+    index = ArchiveIndex(archive_dir)
+    if not os.path.exists(index.path):
+        index.rebuild()
+    done = read_checkpoint(output_dir)
+    # 이전 버전 체크포인트는 색인의 사진 경로를 작업 ID로 기록했음 (zip으로 옮겨진 뒤에도 알아보도록 zip 안 경로로 비교)
+    done_photos = {line.split('!')[-1] for line in done}
+
+    tasks = []
+    missing = 0
+    skipped = 0
+    seen = set()
+    for name, birthdate, _ in ExcelManager.iter_visitors():
+        key = normalize_key(name, birthdate)
+        if key in seen:
+            continue
+        seen.add(key)
+
+        # 가장 최근에 발급한 사진 사용
+        entry = next((entry for entry in index.find(*key) if entry['photo']), None)
+        if entry is None:
+            missing += 1
+            continue
+        photo = entry['photo']
+
+        current_id = task_id(key[0], key[1], entry['issued_at'])
+        if current_id in done or photo.split('!')[-1] in done_photos:
+            skipped += 1
+            continue
+
+        # 결과는 보관 폴더와 같은 날짜 폴더 구조로 저장 (zip 안의 사진도 같은 경로)
+        directory, filename = photo.split('!')[-1].rsplit('/', 1)
+        card_name = 'card_' + os.path.splitext(filename)[0][len('photo_'):] + extension
+        output_path = os.path.join(output_dir, *directory.split('/'), card_name)
+        tasks.append((current_id, photo, key[0], key[1], output_path))
+    return tasks, missing, skipped
+
+
+def _init_worker(archive_dir, template_path, dpi, fmt, quality):
+    _worker['index'] = ArchiveIndex(archive_dir)
+    _worker['template'] = CompiledTemplate(load_template(template_path), dpi)
+    _worker['options'] = save_options(fmt, quality)[1]
+
+
+def _render_one(task):
+    """작업 프로세스에서 카드 한 장 생성 - 작업 ID 반환"""
+    current_id, photo_path, name, birthdate, output_path = task
+    photo = _worker['index'].open_image(photo_path)
+    card = _worker['template'].render({'name': name, 'birthdate': birthdate}, photo)
+
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    write_atomic(output_path, lambda f: card.save(f, **_worker['options']))
+    return current_id
+
+
+def rerender(output_dir, template_path=None, workers=None, dpi=None, fmt=None, quality=None,
+             archive_dir=None, progress=None):
+    """보관된 사진으로 모든 방문자 카드를 새 디자인으로 다시 생성
+
+    끝난 작업은 output_dir의 체크포인트 파일에 기록하므로 중단 후 다시 실행하면 이어서 진행한다.
+    결과 - {'done', 'failed', 'missing', 'skipped', 'seconds', 'workers', 'cards_per_second'}
+    """
+    workers = workers or os.cpu_count() or 1
+    dpi = dpi or Config.PRINTER_DPI
+    extension, _ = save_options(fmt, quality)
+    os.makedirs(output_dir, exist_ok=True)
+
+    tasks, missing, skipped = plan_tasks(output_dir, archive_dir, extension)
+    total = len(tasks)
+    done = failed = 0
+    start = time.perf_counter()
+
+    with open(os.path.join(output_dir, CHECKPOINT_NAME), 'a', encoding='utf-8') as checkpoint, \
+            ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                initargs=(archive_dir, template_path, dpi, fmt, quality)) as executor:
+        pending = {}
+        queued = iter(tasks)
+
+        # 진행 중인 작업 수를 제한하여 대량 작업도 메모리를 일정하게 사용
+        while True:
+            while len(pending) < workers * 4:
+                task = next(queued, None)
+                if task is None:
+                    break
+                pending[executor.submit(_render_one, task)] = task
+
+            if not pending:
+                break
+
+            finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                task = pending.pop(future)
+                try:
+                    checkpoint.write(future.result() + '\n')
+                    done += 1
+                except Exception as e:
+                    failed += 1
+                    logging.error(f"Re-render failed for {task[1]}: {e}")
+            checkpoint.flush()
+            os.fsync(checkpoint.fileno())
+
+            if progress:
+                progress(done + failed, total)
+
+    seconds = time.perf_counter() - start
+    return {
+        'done': done,
+        'failed': failed,
+        'missing': missing,
+        'skipped': skipped,
+        'seconds': round(seconds, 2),
+        'workers': workers,
+        'cards_per_second': round(done / seconds, 1) if seconds > 0 else 0.0,
+    }
+
+
+def main():
+    """카드 디자인 변경 후 전체 재생성 (src 폴더에서 python -m utils.rerender 로 실행)"""
+    parser = argparse.ArgumentParser(description="보관된 사진으로 모든 방문자 카드를 다시 생성")
+    parser.add_argument('output', help="새 카드를 저장할 폴더 (같은 폴더로 다시 실행하면 이어서 진행)")
+    parser.add_argument('--template', help="새 카드 디자인 JSON (기본: resources/card_template.json)")
+    parser.add_argument('--workers', type=int, help="작업 프로세스 수 (기본: CPU 코어 수)")
+    parser.add_argument('--dpi', type=int, default=Config.PRINTER_DPI)
+    parser.add_argument('--format', choices=['png', 'jpeg', 'webp'], default=Config.ARCHIVE_FORMAT)
+    args = parser.parse_args()
+
+    def print_progress(done, total):
+        print(f"\r생성 중... {done}/{total}", end='', flush=True)
+
+    result = rerender(args.output, args.template, args.workers, args.dpi, args.format, progress=print_progress)
+    print(f"\n{result['done']}장 생성, {result['failed']}장 실패, 이전 실행에서 완료 {result['skipped']}장, "
+          f"사진 없음 {result['missing']}명")
+    print(f"{result['seconds']}초, 초당 {result['cards_per_second']}장 "
+          f"(작업 프로세스 {result['workers']}개 / CPU 코어 {os.cpu_count()}개, "
+          f"코어당 {result['cards_per_second'] / result['workers']:.1f}장)")
+
+
+if __name__ == "__main__":
+    main()
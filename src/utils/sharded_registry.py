@@ -0,0 +1,279 @@
+import argparse
+import hashlib
+import json
+import logging
+import math
+import os
+import random
+import struct
+import threading
+from datetime import datetime
+
+from config import Config
+from utils.files import write_atomic
+from utils.registry import COLUMNS, normalize_key, read_visitor_excel, write_visitor_excel
+
+SHARD_PREFIX = 'visitors_'
+SHARD_SUFFIX = '.jsonl'
+FILTER_SUFFIX = '.bloom'
+
+
+class BloomFilter:
+    """정규화된 (이름, 생년월일) 키용 블룸 필터"""
+
+    MAGIC = b'BLM1'
+    HEADER = struct.Struct('<4sIQQQ')  # magic, 해시 수, 비트 수, 항목 수, 반영한 샤드 크기
+
+    def __init__(self, num_bits, num_hashes, count=0, covered_size=0, bits=None):
+        self.num_bits = num_bits
+        self.num_hashes = num_hashes
+        self.count = count
+        self.covered_size = covered_size
+        self.bits = bits if bits is not None else bytearray((num_bits + 7) // 8)
+
+    @classmethod
+    def for_capacity(cls, capacity, fp_rate):
+        """예상 항목 수와 목표 오탐률에 맞는 크기로 생성"""
+        capacity = max(capacity, 1)
+        num_bits = int(math.ceil(-capacity * math.log(fp_rate) / (math.log(2) ** 2)))
+        num_hashes = max(1, int(round(num_bits / capacity * math.log(2))))
+        return cls(num_bits, num_hashes)
+
+    def _positions(self, key):
+        digest = hashlib.blake2b('\x1f'.join(key).encode('utf-8'), digest_size=16).digest()
+        h1, h2 = struct.unpack('<QQ', digest)
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def add(self, key):
+        for position in self._positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, key):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+    def expected_fp_rate(self):
+        """현재 항목 수 기준 이론상 오탐률"""
+        return (1 - math.exp(-self.num_hashes * self.count / self.num_bits)) ** self.num_hashes
+
+    def save(self, path):
+        header = self.HEADER.pack(self.MAGIC, self.num_hashes, self.num_bits, self.count, self.covered_size)
+        write_atomic(path, lambda f: f.write(header + self.bits))
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as f:
+            data = f.read()
+        magic, num_hashes, num_bits, count, covered_size = cls.HEADER.unpack_from(data)
+        if magic != cls.MAGIC:
+            raise ValueError(f"블룸 필터 파일 형식 오류: {path}")
+        return cls(num_bits, num_hashes, count, covered_size, bytearray(data[cls.HEADER.size:]))
+
+
+class ShardedRegistry:
+    """월별로 분할한 방문자 저장소 - 필터가 일치 가능성을 보고한 샤드만 읽음"""
+
+    def __init__(self, shard_dir=None):
+        self.shard_dir = shard_dir or Config.SHARD_DIR
+        self.created = not os.path.isdir(self.shard_dir)
+        self._lock = threading.Lock()
+        self._filters = {}
+
+        os.makedirs(self.shard_dir, exist_ok=True)
+        self._load_filters()
+
+    def _shard_path(self, month):
+        return os.path.join(self.shard_dir, f'{SHARD_PREFIX}{month}{SHARD_SUFFIX}')
+
+    def _filter_path(self, month):
+        return os.path.join(self.shard_dir, f'{SHARD_PREFIX}{month}{FILTER_SUFFIX}')
+
+    def months(self):
+        """샤드 월 목록 (최신순)"""
+        months = [
+            name[len(SHARD_PREFIX):-len(SHARD_SUFFIX)]
+            for name in os.listdir(self.shard_dir)
+            if name.startswith(SHARD_PREFIX) and name.endswith(SHARD_SUFFIX)
+        ]
+        return sorted(months, reverse=True)
+
+    @staticmethod
+    def _month_of(registered_at):
+        """'YYYY-MM-DD HH:MM:SS' -> 'YYYYMM'"""
+        return str(registered_at)[:7].replace('-', '')
+
+    def _read_shard(self, month):
+        """샤드의 레코드 목록 반환 (잘린 마지막 줄은 무시)"""
+        records = []
+        path = self._shard_path(month)
+        if not os.path.exists(path):
+            return records
+
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                records.append((record.get('이름', ''), record.get('생년월일', ''), record.get('등록일시', '')))
+        return records
+
+    def _load_filters(self):
+        """필터 로드 - 없거나 샤드와 크기가 맞지 않으면 재생성"""
+        for month in self.months():
+            shard_size = os.path.getsize(self._shard_path(month))
+            try:
+                bloom = BloomFilter.load(self._filter_path(month))
+                if bloom.covered_size == shard_size:
+                    self._filters[month] = bloom
+                    continue
+            except (OSError, ValueError, struct.error):
+                pass
+            logging.info(f"Rebuilding shard filter: {month}")
+            self.rebuild_filter(month)
+
+    def rebuild_filter(self, month):
+        """샤드 전체를 읽어 필터 재생성 - 항목 수에 맞게 크기 조정"""
+        records = self._read_shard(month)
+        bloom = BloomFilter.for_capacity(
+            max(Config.SHARD_FILTER_CAPACITY, len(records) * 2), Config.SHARD_FILTER_FP_RATE
+        )
+        for name, birthdate, _ in records:
+            bloom.add(normalize_key(name, birthdate))
+        bloom.covered_size = os.path.getsize(self._shard_path(month))
+        bloom.save(self._filter_path(month))
+        self._filters[month] = bloom
+        return bloom
+
+    def rebuild_filters(self):
+        """모든 샤드의 필터 재생성"""
+        with self._lock:
+            return {month: self.rebuild_filter(month) for month in self.months()}
+
+    def _shard_contains(self, month, key):
+        return any(normalize_key(name, birthdate) == key for name, birthdate, _ in self._read_shard(month))
+
+    def _contains_key(self, key):
+        # 호출하는 쪽에서 self._lock을 잡고 있어야 함
+        return any(
+            key in bloom and self._shard_contains(month, key)
+            for month, bloom in sorted(self._filters.items(), reverse=True)
+        )
+
+    def contains(self, name, birthdate):
+        """중복 여부 확인 - 필터가 일치 가능성을 보고한 샤드만 열어서 확인"""
+        with self._lock:
+            return self._contains_key(normalize_key(name, birthdate))
+
+    def add_many(self, records):
+        """여러 방문자 추가 (이미 등록된 키는 제외) - 추가된 수 반환"""
+        # 중복 확인과 추가를 한 잠금 안에서 처리 (동시에 같은 방문자를 추가해도 한 번만 기록)
+        with self._lock:
+            by_month = {}
+            seen = set()
+            for name, birthdate, registered_at in records:
+                key = normalize_key(name, birthdate)
+                if key in seen or self._contains_key(key):
+                    continue
+                seen.add(key)
+                by_month.setdefault(self._month_of(registered_at), []).append((name, birthdate, registered_at))
+
+            for month, month_records in by_month.items():
+                path = self._shard_path(month)
+                with open(path, 'a', encoding='utf-8') as f:
+                    f.write(''.join(
+                        json.dumps(dict(zip(COLUMNS, record)), ensure_ascii=False) + '\n'
+                        for record in month_records
+                    ))
+                    f.flush()
+                    os.fsync(f.fileno())
+
+                bloom = self._filters.get(month)
+                if bloom is None:
+                    bloom = BloomFilter.for_capacity(
+                        max(Config.SHARD_FILTER_CAPACITY, len(month_records) * 2), Config.SHARD_FILTER_FP_RATE
+                    )
+                    self._filters[month] = bloom
+                for name, birthdate, _ in month_records:
+                    bloom.add(normalize_key(name, birthdate))
+
+                # 용량을 넘어 오탐률이 커지면 더 큰 필터로 재생성
+                if bloom.expected_fp_rate() > Config.SHARD_FILTER_FP_RATE * 2:
+                    self.rebuild_filter(month)
+                else:
+                    bloom.covered_size = os.path.getsize(path)
+                    bloom.save(self._filter_path(month))
+
+        return len(seen)
+
+    def add(self, name, birthdate, registered_at=None):
+        """방문자 추가 - 이미 등록된 경우 False 반환"""
+        registered_at = registered_at or datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        return self.add_many([(name, birthdate, registered_at)]) == 1
+
+    def keys(self):
+        """등록된 정규화 키 집합 (모든 샤드를 읽음)"""
+        return {
+            normalize_key(name, birthdate)
+            for rows in self.iter_rows()
+            for name, birthdate, _ in rows
+        }
+
+    def count(self):
+        """등록된 방문자 수"""
+        with self._lock:
+            return sum(bloom.count for bloom in self._filters.values())
+
+    def iter_rows(self, chunk_size=5000):
+        """오래된 샤드부터 방문자 행을 chunk_size 단위로 반환"""
+        for month in reversed(self.months()):
+            records = self._read_shard(month)
+            for start in range(0, len(records), chunk_size):
+                yield records[start:start + chunk_size]
+
+    def import_excel(self, excel_path):
+        """기존 엑셀 파일을 한 번에 가져오기 - (추가된 수, 건너뛴 수) 반환"""
+        records = read_visitor_excel(excel_path)
+        imported = self.add_many(records)
+        return imported, len(records) - imported
+
+    def export_excel(self, excel_path=None, progress=None, chunk_size=5000):
+        """엑셀 파일로 내보내기 (직원 확인용)"""
+        return write_visitor_excel(excel_path or Config.EXCEL_PATH, self.iter_rows(chunk_size), self.count(), progress)
+
+    def measure_fp_rate(self, samples=100000):
+        """등록되지 않은 임의 키로 샤드별 실제 오탐률 측정 - {월: (측정값, 이론값)}"""
+        rng = random.Random(0)
+        results = {}
+        with self._lock:
+            for month, bloom in sorted(self._filters.items()):
+                false_positives = sum(
+                    (f'__probe{rng.getrandbits(64):x}', '00000000') in bloom
+                    for _ in range(samples)
+                )
+                results[month] = (false_positives / samples, bloom.expected_fp_rate())
+        return results
+
+
+def main():
+    """월별 분할 저장소 관리 명령 (src 폴더에서 python -m utils.sharded_registry 로 실행)"""
+    parser = argparse.ArgumentParser(description="월별 분할 저장소 필터 관리")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    subparsers.add_parser('rebuild', help="모든 샤드의 블룸 필터 재생성")
+    fp_parser = subparsers.add_parser('fp-rate', help="샤드별 오탐률 측정")
+    fp_parser.add_argument('--samples', type=int, default=100000)
+    args = parser.parse_args()
+
+    registry = ShardedRegistry()
+
+    if args.command == 'rebuild':
+        for month, bloom in registry.rebuild_filters().items():
+            print(f"{month}: {bloom.count}건, {bloom.num_bits // 8} bytes, 해시 {bloom.num_hashes}개")
+    elif args.command == 'fp-rate':
+        for month, (measured, expected) in registry.measure_fp_rate(args.samples).items():
+            print(f"{month}: 측정 {measured:.5f}, 이론 {expected:.5f}")
+
+
+if __name__ == "__main__":
+    main()
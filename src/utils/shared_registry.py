@@ -0,0 +1,168 @@
+import json
+import logging
+import os
+import threading
+import time
+
+from config import Config
+from utils.registry import COLUMNS, normalize_key
+
+if os.name == 'nt':
+    import msvcrt
+else:
+    import fcntl
+
+
+class FileLock:
+    """프로세스/PC 간 권고 잠금 (공유 폴더의 잠금 파일 사용)"""
+
+    def __init__(self, path, timeout=10):
+        self.path = path
+        self.timeout = timeout
+        self._file = None
+
+    def __enter__(self):
+        self._file = open(self.path, 'a+b')
+        deadline = time.monotonic() + self.timeout
+
+        while True:
+            try:
+                if os.name == 'nt':
+                    self._file.seek(0)
+                    msvcrt.locking(self._file.fileno(), msvcrt.LK_NBLCK, 1)
+                else:
+                    fcntl.flock(self._file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                return self
+            except OSError:
+                if time.monotonic() > deadline:
+                    self._file.close()
+                    raise TimeoutError(f"잠금 대기 시간 초과: {self.path}")
+                time.sleep(0.05)
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            if os.name == 'nt':
+                self._file.seek(0)
+                msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+        finally:
+            self._file.close()
+
+
+class SharedRegistry:
+    """여러 키오스크가 공유 폴더로 발급 이력을 공유하는 저장소
+
+    키오스크마다 segments/<키오스크ID>.jsonl 파일에만 추가로 기록하고,
+    다른 키오스크의 파일은 마지막으로 읽은 위치 이후만 읽어 인덱스에 반영한다.
+    """
+
+    def __init__(self, root_dir=None, kiosk_id=None):
+        self.root_dir = root_dir or Config.SHARED_REGISTRY_DIR
+        self.kiosk_id = kiosk_id or Config.KIOSK_ID
+        self.segments_dir = os.path.join(self.root_dir, 'segments')
+        self.lock_path = os.path.join(self.root_dir, 'registry.lock')
+        self.segment_path = os.path.join(self.segments_dir, f'{self.kiosk_id}.jsonl')
+
+        self._keys = set()
+        self._offsets = {}
+        self._lock = threading.Lock()
+
+        os.makedirs(self.segments_dir, exist_ok=True)
+
+    def refresh(self):
+        """각 세그먼트에서 새로 추가된 부분만 읽어 인덱스 갱신"""
+        with self._lock:
+            for entry in os.scandir(self.segments_dir):
+                if not entry.name.endswith('.jsonl'):
+                    continue
+
+                size = entry.stat().st_size
+                offset = self._offsets.get(entry.name, 0)
+                if size < offset:
+                    # 세그먼트가 외부에서 잘리거나 교체된 경우 전체 재생성
+                    self._keys.clear()
+                    self._offsets.clear()
+                    return self._rebuild()
+                if size > offset:
+                    self._offsets[entry.name] = offset + self._read_segment(entry.path, offset, size)
+
+    def _rebuild(self):
+        """잠금을 가진 상태에서 모든 세그먼트를 처음부터 다시 읽기"""
+        for entry in os.scandir(self.segments_dir):
+            if entry.name.endswith('.jsonl'):
+                self._offsets[entry.name] = self._read_segment(entry.path, 0, entry.stat().st_size)
+
+    def _read_segment(self, path, offset, size):
+        """offset부터 size까지 읽어 완성된 줄만 반영 - 읽은 바이트 수 반환"""
+        with open(path, 'rb') as f:
+            f.seek(offset)
+            data = f.read(size - offset)
+
+        # 기록 중인 마지막 줄은 다음에 다시 읽음
+        end = data.rfind(b'\n') + 1
+        for line in data[:end].splitlines():
+            try:
+                record = json.loads(line.decode('utf-8'))
+            except ValueError:
+                continue
+            self._keys.add(normalize_key(record.get('이름', ''), record.get('생년월일', '')))
+        return end
+
+    def contains(self, name, birthdate):
+        """모든 키오스크의 발급 이력에서 중복 여부 확인"""
+        self.refresh()
+        return normalize_key(name, birthdate) in self._keys
+
+    def keys(self):
+        """모든 키오스크의 정규화 키 집합"""
+        self.refresh()
+        with self._lock:
+            return set(self._keys)
+
+    def add_many(self, records):
+        """공유 잠금 안에서 중복을 확인하고 이 키오스크의 세그먼트에 추가 - 추가된 레코드 목록 반환"""
+        with FileLock(self.lock_path):
+            self.refresh()
+
+            accepted = []
+            seen = set()
+            for record in records:
+                key = normalize_key(record[0], record[1])
+                if key in self._keys or key in seen:
+                    continue
+                seen.add(key)
+                accepted.append(record)
+
+            if accepted:
+                with open(self.segment_path, 'a', encoding='utf-8') as f:
+                    f.write(''.join(
+                        json.dumps(dict(zip(COLUMNS, record)), ensure_ascii=False) + '\n'
+                        for record in accepted
+                    ))
+                    f.flush()
+                    os.fsync(f.fileno())
+
+            return accepted
+
+    def add(self, name, birthdate, registered_at):
+        """방문자 추가 - 다른 키오스크에서 이미 등록된 경우 False 반환"""
+        return bool(self.add_many([(name, birthdate, registered_at)]))
+
+
+_shared_registry = None
+_shared_registry_lock = threading.Lock()
+
+
+def get_shared_registry():
+    """공유 저장소 반환 - 설정되지 않은 경우 None"""
+    global _shared_registry
+    if not Config.SHARED_REGISTRY_DIR:
+        return None
+
+    with _shared_registry_lock:
+        if _shared_registry is None:
+            _shared_registry = SharedRegistry()
+            _shared_registry.refresh()
+            logging.info(f"Shared registry ready: {Config.SHARED_REGISTRY_DIR} (kiosk: {Config.KIOSK_ID})")
+        return _shared_registry
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# 앱과 같이 src를 기준으로 import (python -m utils.X 와 동일)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
@@ -0,0 +1,36 @@
+import sys
+import types
+
+import pytest
+
+from utils.print_backends import Win32PrinterSession
+
+PRINTER_STATUS_PRINTING = 0x400
+PRINTER_STATUS_PAPER_OUT = 0x10
+
+
+@pytest.fixture
+def session(monkeypatch):
+    """GetPrinter가 지정한 상태를 돌려주는 win32print로 바꾼 세션"""
+    state = {'Status': 0, 'Attributes': 0, 'cJobs': 1}
+    win32print = types.SimpleNamespace(GetPrinter=lambda handle, level: dict(state))
+    monkeypatch.setitem(sys.modules, 'win32print', win32print)
+
+    session = Win32PrinterSession()
+    session.printer_name = 'Card Printer'
+    session.status = state
+    return session
+
+
+def test_printing_is_available(session):
+    session.status['Status'] = PRINTER_STATUS_PRINTING
+    available, detail = session.query_status()
+    assert available
+    assert '준비됨' in detail
+
+
+def test_paper_out_is_unavailable(session):
+    session.status['Status'] = PRINTER_STATUS_PAPER_OUT | PRINTER_STATUS_PRINTING
+    available, detail = session.query_status()
+    assert not available
+    assert '용지 없음' in detail